@@ -0,0 +1,310 @@
+"""
+Shared setup and probe helpers for test_vision.py
+
+Successful probes are cached on disk for 24 hours per API key, model,
+messages and TLS mode; set VISION_PROBE_CACHE=0 (or pass --no-cache to
+test_vision.py) to force live calls.
+"""
+
+import io
+import os
+import re
+import sys
+import ssl
+import time
+import types
+import atexit
+import threading
+import hashlib
+import inspect
+import functools
+import contextlib
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional, Union
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from modules.tiered_cache import TieredCache
+
+load_dotenv()
+
+BAR = "=" * 60
+
+PROBE_CACHE = TieredCache(
+    directory=os.getenv("VISION_PROBE_CACHE_DIR", ".cache/vision_probes"),
+    ttl_seconds=float(os.getenv("VISION_PROBE_CACHE_TTL", 24 * 3600)),
+    enabled=os.getenv("VISION_PROBE_CACHE", "1") == "1",
+    label="Vision probe cache"
+)
+
+
+def _orjson_response(response: requests.Response, *args, **kwargs) -> requests.Response:
+    """Response hook: have response.json(), which the SDK parses every reply with, decode via orjson"""
+    response.json = lambda **json_kwargs: orjson.loads(response.content)
+    return response
+
+
+class ContextAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all share one prebuilt SSLContext"""
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs["ssl_context"] = self.ssl_context
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+class ProbeSession(requests.Session):
+    """
+    Keep-alive session shared by the text and vision calls
+
+    dashscope>=1.26 takes it through the session= keyword. Older SDKs open
+    `with requests.Session()` around every call, so close() is a no-op and
+    the real close runs at exit.
+    """
+
+    def close(self):
+        pass
+
+
+def _make_session(verify: Union[bool, ssl.SSLContext]) -> ProbeSession:
+    session = ProbeSession()
+    # No adapter-level retries: probe() already retries connection errors and HTTP 429/5xx
+    adapter_kwargs = {"pool_maxsize": 10}
+    if isinstance(verify, ssl.SSLContext):
+        adapter = ContextAdapter(verify, **adapter_kwargs)
+        # The context decides verification; an unverified context must not
+        # have requests load a CA bundle into it and demand certificates
+        session.verify = verify.verify_mode != ssl.CERT_NONE
+    else:
+        adapter = HTTPAdapter(**adapter_kwargs)
+        session.verify = verify
+    session.mount("https://", adapter)
+    session.hooks["response"].append(_orjson_response)
+    atexit.register(requests.Session.close, session)
+    return session
+
+
+def _warm_up(session: requests.Session, url: str) -> None:
+    """Resolve, connect and handshake with url's host so the first call finds a pooled connection"""
+    try:
+        session.head(url, timeout=5)
+    except Exception:
+        pass
+
+
+def _sdk_accepts_session() -> bool:
+    """True if this dashscope version supports the session= keyword (1.26+)"""
+    from dashscope.api_entities.api_request_factory import _build_api_request
+    return "session" in inspect.signature(_build_api_request).parameters
+
+
+@functools.lru_cache(maxsize=None)
+def setup(verify: Union[bool, ssl.SSLContext] = True):
+    """
+    Check the API key, import and configure dashscope, and route the SDK
+    through a shared keep-alive session. Runs once per interpreter and
+    verify setting; exits the script if the key or the SDK is missing.
+
+    Args:
+        verify: TLS verification for the shared session: True, False,
+                or a prebuilt ssl.SSLContext
+
+    Returns:
+        Tuple of (api_key, text_call, vision_call), where the calls are
+        Generation.call and MultiModalConversation.call bound to the
+        shared session
+    """
+    api_key = os.getenv("DASHSCOPE_API_KEY")
+    if not api_key:
+        print("ERROR: DASHSCOPE_API_KEY not found in .env")
+        sys.exit(1)
+
+    try:
+        import dashscope
+        from dashscope import MultiModalConversation, Generation
+        from dashscope.api_entities import http_request
+    except ImportError as e:
+        print(f"ERROR: {e}\n")
+        sys.exit(1)
+
+    dashscope.api_key = api_key
+
+    session = _make_session(verify)
+    if _sdk_accepts_session():
+        text_call = functools.partial(Generation.call, session=session)
+        vision_call = functools.partial(MultiModalConversation.call, session=session)
+    else:
+        # Older SDKs have no session hook; have them build their per-call
+        # sessions from the shared one
+        http_request.requests = types.SimpleNamespace(**dict(vars(requests), Session=lambda: session))
+        text_call = Generation.call
+        vision_call = MultiModalConversation.call
+
+    # DNS + TCP + TLS for the API host run in the background while the script
+    # prints its header, instead of in front of the first probe
+    base_url = getattr(dashscope, "base_http_api_url", None) or "https://dashscope.aliyuncs.com/api/v1"
+    threading.Thread(target=_warm_up, args=(session, base_url), daemon=True).start()
+
+    return api_key, text_call, vision_call
+
+
+# Failure classifier, matched once against "<code>\n<message>". Alternatives
+# are tried in priority order at the start of the text; each lookahead checks
+# the code (before the newline) or the message (after it), and the empty
+# named group that follows tells which one matched.
+_ERROR_KIND_RE = re.compile(
+    r"\A(?:"
+    r"(?=[^\n]*invalidapikey|.*\n.*invalid)(?P<invalid>)"
+    r"|(?=[^\n]*notfound|.*\n.*not found)(?P<notfound>)"
+    r"|(?=.*\n.*quota|[^\n]*arrearage)(?P<quota>)"
+    r")",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def classify_error(code: Optional[str], message: Optional[str]) -> Optional[str]:
+    """
+    Classify a failed API response
+
+    Returns:
+        'invalid' (bad or expired key), 'notfound' (model not available
+        to this key), 'quota' (out of credits), or None if unrecognized
+    """
+    match = _ERROR_KIND_RE.match(f"{code}\n{message}")
+    return match.lastgroup if match else None
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one API probe; failures are recorded instead of raised"""
+    name: str
+    ok: bool
+    status_code: Optional[int] = None
+    code: Optional[str] = None
+    message: Optional[str] = None
+    error_kind: Optional[str] = None  # classify_error() of an HTTP failure
+    latency_ms: float = 0.0
+    attempts: int = 1
+    reply: Optional[str] = None
+    cached: bool = False
+
+
+# Errors worth retrying: the connection dropped or timed out before a reply
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)
+
+
+def _reply_text(response) -> Optional[str]:
+    """Text of the first choice, for both text and multimodal responses"""
+    try:
+        content = response.output.choices[0].message.content
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return None
+    if isinstance(content, list):
+        content = next((part["text"] for part in content if "text" in part), None)
+    return content
+
+
+def _probe_cache_key(model: str, messages, cache_tag: str) -> str:
+    """Hash API key, model, messages and tag into a probe cache key"""
+    request = {
+        "api_key": hashlib.sha256(os.getenv("DASHSCOPE_API_KEY", "").encode("utf-8")).hexdigest(),
+        "model": model,
+        "messages": messages,
+        "tag": cache_tag
+    }
+    return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def probe(name: str, call: Callable, *args, max_tries: int = 3, cache_tag: str = "", **kwargs) -> ProbeResult:
+    """
+    Run one SDK call and record its outcome
+
+    Transient failures (connection errors, timeouts, HTTP 429/5xx) are
+    retried with exponential backoff; any other exception is recorded on
+    the result so the remaining probes still run. A successful result is
+    served from PROBE_CACHE on later runs.
+
+    Args:
+        name: Label shown in the summary table
+        call: SDK function, e.g. Generation.call
+        max_tries: Attempts before giving up on a transient failure
+        cache_tag: Extra cache key part, e.g. the TLS mode the call ran under
+        *args, **kwargs: Passed through to call
+
+    Returns:
+        ProbeResult for the final attempt; latency covers all attempts
+    """
+    cache_key = _probe_cache_key(kwargs.get("model"), kwargs.get("messages"), cache_tag)
+    cached = PROBE_CACHE.get(cache_key)
+    if cached is not None:
+        return replace(ProbeResult(**cached), name=name, cached=True)
+
+    start_ns = time.perf_counter_ns()
+    for attempt in range(1, max_tries + 1):
+        try:
+            response = call(*args, **kwargs)
+        except TRANSIENT_ERRORS as e:
+            if attempt < max_tries:
+                time.sleep(0.5 * 2 ** (attempt - 1))
+                continue
+            result = ProbeResult(name, False, code=type(e).__name__, message=str(e))
+        except Exception as e:
+            result = ProbeResult(name, False, code=type(e).__name__, message=str(e))
+        else:
+            status_code = response.status_code
+            if (status_code == 429 or status_code >= 500) and attempt < max_tries:
+                time.sleep(0.5 * 2 ** (attempt - 1))
+                continue
+            ok = status_code == 200
+            result = ProbeResult(name, ok, status_code=status_code)
+            if ok:
+                result.reply = _reply_text(response)
+            else:
+                result.code = str(response.code)
+                result.message = str(response.message)
+                result.error_kind = classify_error(result.code, result.message)
+        result.attempts = attempt
+        result.latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        if result.ok:
+            PROBE_CACHE.set(cache_key, vars(result))
+        return result
+
+
+@contextlib.contextmanager
+def buffered_output():
+    """Collect everything printed in the block and write it to stdout in one call"""
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            yield
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+def print_summary(results: List[ProbeResult]) -> None:
+    """Print one row per probe: name, outcome, status, latency, attempts, error"""
+    print(BAR)
+    print("SUMMARY")
+    print(BAR)
+    width = max((len(result.name) for result in results), default=0)
+    for result in results:
+        outcome = "OK" if result.ok else "FAIL"
+        status = result.status_code if result.status_code is not None else "-"
+        line = f"  {result.name:<{width}} {outcome:<5} {status!s:<5} {result.latency_ms:8.0f} ms  x{result.attempts}"
+        if result.cached:
+            line += "  (cached)"
+        if not result.ok:
+            line += f"  {result.code}: {result.message}"
+        print(line)
+    print(BAR)
@@ -5,15 +5,16 @@ Uses Alibaba Qwen 3 LLM for intelligent fact verification
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List
 import os
 from dotenv import load_dotenv
 
-from modules.input_processor import SimpleInputProcessor
+from modules.qwen_client import get_qwen_client
+from modules.input_processor import SimpleInputProcessor, close_async_client as close_http_client
 from modules.claim_extractor import ClaimExtractor
-from modules.search_engine import MVPSearchEngine
+from modules.search_engine import MVPSearchEngine, close_async_client as close_search_client
 from modules.context_analyzer import ContextAnalyzer
 from modules.verifier import SimpleVerifier
 
@@ -24,7 +25,8 @@ load_dotenv()
 app = FastAPI(
     title="Fact-Checking MVP with Context",
     description="AI-powered fact-checker using Alibaba Qwen 3",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend
@@ -61,6 +63,14 @@ class FactCheckResponse(BaseModel):
     scores: dict
 
 
+@app.on_event("shutdown")
+async def close_clients():
+    """Close pooled HTTP sessions"""
+    await get_qwen_client().aclose()
+    await close_http_client()
+    await close_search_client()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -71,6 +81,40 @@ async def root():
     }
 
 
+async def run_factcheck_pipeline(text: str) -> dict:
+    """
+    Run claim extraction, search, context analysis and verdict on text
+
+    Args:
+        text: Processed input text
+
+    Returns:
+        Response dict matching FactCheckResponse
+    """
+    # Extract claims
+    claims = await claim_extractor.extract_claims_async(text)
+    
+    # Search and verify
+    evidence = await search_engine.asearch_and_verify(claims)
+    
+    # Analyze context (independent LLM calls run concurrently)
+    context = await context_analyzer.analyze_context_async(claims['main_claim'], evidence)
+    
+    # Calculate verdict
+    verdict_data = verifier.calculate_verdict(claims['main_claim'], evidence, context)
+    
+    return {
+        "verdict": verdict_data['verdict'],
+        "confidence": verdict_data['confidence'],
+        "main_claim": claims['main_claim'],
+        "key_facts": claims['key_facts'],
+        "context": context,
+        "evidence": evidence,
+        "timeline": context.get('timeline', []),
+        "scores": verdict_data['scores']
+    }
+
+
 @app.post("/api/factcheck/text", response_model=FactCheckResponse)
 async def factcheck_text(input_data: TextInput):
     """
@@ -80,28 +124,7 @@ async def factcheck_text(input_data: TextInput):
         # Process input
         processed = input_processor.process(input_data.text, "text")
         
-        # Extract claims
-        claims = claim_extractor.extract_claims(processed['text'])
-        
-        # Search and verify
-        evidence = search_engine.search_and_verify(claims)
-        
-        # Analyze context
-        context = context_analyzer.analyze_context(claims['main_claim'], evidence)
-        
-        # Calculate verdict
-        verdict_data = verifier.calculate_verdict(claims['main_claim'], evidence, context)
-        
-        return {
-            "verdict": verdict_data['verdict'],
-            "confidence": verdict_data['confidence'],
-            "main_claim": claims['main_claim'],
-            "key_facts": claims['key_facts'],
-            "context": context,
-            "evidence": evidence,
-            "timeline": context.get('timeline', []),
-            "scores": verdict_data['scores']
-        }
+        return await run_factcheck_pipeline(processed['text'])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -113,30 +136,9 @@ async def factcheck_url(input_data: URLInput):
     """
     try:
         # Process URL
-        processed = input_processor.process(input_data.url, "url")
-        
-        # Extract claims
-        claims = claim_extractor.extract_claims(processed['text'])
-        
-        # Search and verify
-        evidence = search_engine.search_and_verify(claims)
+        processed = await input_processor.process_async(input_data.url, "url")
         
-        # Analyze context
-        context = context_analyzer.analyze_context(claims['main_claim'], evidence)
-        
-        # Calculate verdict
-        verdict_data = verifier.calculate_verdict(claims['main_claim'], evidence, context)
-        
-        return {
-            "verdict": verdict_data['verdict'],
-            "confidence": verdict_data['confidence'],
-            "main_claim": claims['main_claim'],
-            "key_facts": claims['key_facts'],
-            "context": context,
-            "evidence": evidence,
-            "timeline": context.get('timeline', []),
-            "scores": verdict_data['scores']
-        }
+        return await run_factcheck_pipeline(processed['text'])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -147,52 +149,30 @@ async def factcheck_image(file: UploadFile = File(...)):
     Fact-check image with text (OCR)
     """
     try:
-        # Save uploaded file temporarily
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-        file_path = os.path.join(upload_dir, file.filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Process image
-        processed = input_processor.process(file_path, "image")
+        # Process image directly from memory (no temporary file); the pipeline
+        # starts as soon as the visible text is known
+        content = await file.read()
+        text = await input_processor.extract_image_text_async(content)
         
-        # Clean up
-        os.remove(file_path)
-        
-        # Extract claims
-        claims = claim_extractor.extract_claims(processed['text'])
-        
-        # Search and verify
-        evidence = search_engine.search_and_verify(claims)
-        
-        # Analyze context
-        context = context_analyzer.analyze_context(claims['main_claim'], evidence)
-        
-        # Calculate verdict
-        verdict_data = verifier.calculate_verdict(claims['main_claim'], evidence, context)
-        
-        return {
-            "verdict": verdict_data['verdict'],
-            "confidence": verdict_data['confidence'],
-            "main_claim": claims['main_claim'],
-            "key_facts": claims['key_facts'],
-            "context": context,
-            "evidence": evidence,
-            "timeline": context.get('timeline', []),
-            "scores": verdict_data['scores']
-        }
+        return await run_factcheck_pipeline(text)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
     import uvicorn
+    from importlib.util import find_spec
+
+    # Auto-reload is for development only and cannot be combined with workers
+    reload = os.getenv("API_RELOAD", "0") == "1"
+
     uvicorn.run(
         "app:app",
         host=os.getenv("API_HOST", "0.0.0.0"),
         port=int(os.getenv("API_PORT", 8000)),
-        reload=True
+        # libuv event loop and C HTTP parser when installed (uvloop is not available on Windows)
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        workers=1 if reload else int(os.getenv("WEB_CONCURRENCY", 4)),
+        reload=reload
     )
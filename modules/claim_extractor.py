@@ -3,42 +3,53 @@ Claim Extractor Module
 Uses Alibaba Qwen 3 to extract factual claims from text
 """
 
-from modules.qwen_client import QwenClient
-from typing import Dict, List
+from modules.qwen_client import QwenClient, get_qwen_client
+from typing import Dict, List, Optional
+from functools import lru_cache
+import asyncio
+import os
+import re
 
+# Optional local NLP for the short-input fast path
+try:
+    import spacy
+except ImportError:
+    spacy = None
 
-class ClaimExtractor:
-    """Extract verifiable claims from text using Qwen 3"""
-    
-    def __init__(self):
-        self.qwen = QwenClient()
-    
-    def extract_claims(self, text: str) -> Dict:
-        """
-        Extract main claims and key facts from text
-        
-        Args:
-            text: Input text to analyze
-            
-        Returns:
-            Dict with main_claim, key_facts, entities, and dates
-        """
-        prompt = f"""
+try:
+    from dateparser.search import search_dates
+except ImportError:
+    search_dates = None
+
+
+# Inputs shorter than this many words (single sentence) skip the Qwen call; 0 disables
+FAST_PATH_MAX_WORDS = int(os.getenv("CLAIM_FAST_PATH_WORDS", 40))
+
+# A sentence terminator followed by more text means multi-sentence input
+_SENTENCE_BREAK_RE = re.compile(r'[.!?]+\s+\S')
+
+_ENTITY_LABELS = {"PERSON", "ORG", "GPE", "LOC", "NORP", "FAC", "EVENT"}
+
+
+# Static prompt text, split around the input text so it is built once
+_CLAIM_PROMPT_HEAD = """
 Extract the main factual claims from this text that can be verified.
 Return as JSON with the following structure:
 
-{{
+{
     "main_claim": "primary claim being made",
     "key_facts": [
-        {{"claim": "specific fact 1", "checkable": true}},
-        {{"claim": "specific fact 2", "checkable": false}}
+        {"claim": "specific fact 1", "checkable": true},
+        {"claim": "specific fact 2", "checkable": false}
     ],
     "entities": ["person1", "organization1", "location1"],
     "dates_mentioned": ["date1", "date2"]
-}}
+}
 
 Text to analyze:
-{text}
+"""
+
+_CLAIM_PROMPT_TAIL = """
 
 Important:
 - Extract only verifiable factual claims
@@ -47,28 +58,122 @@ Important:
 - Extract any dates or time references
 - Keep the main_claim concise and clear
 """
+
+
+@lru_cache(maxsize=1)
+def _get_nlp():
+    """Load the spaCy English pipeline once; None if unavailable"""
+    if spacy is None:
+        return None
+    try:
+        return spacy.load("en_core_web_sm", disable=["lemmatizer", "textcat"])
+    except Exception as e:
+        print(f"Warning: spaCy model unavailable, claim fast path disabled: {e}")
+        return None
+
+
+class ClaimExtractor:
+    """Extract verifiable claims from text using Qwen 3"""
+    
+    def __init__(self, qwen: Optional[QwenClient] = None):
+        # Share one client (and its connection pool) across modules by default
+        self.qwen = qwen or get_qwen_client()
+    
+    def extract_claims(self, text: str) -> Dict:
+        """
+        Extract main claims and key facts from text
         
-        try:
-            result = self.qwen.extract_json_response(prompt)
-            
-            # Ensure required fields exist
-            if 'main_claim' not in result:
-                result['main_claim'] = text[:200] if len(text) > 200 else text
-            if 'key_facts' not in result:
-                result['key_facts'] = []
-            if 'entities' not in result:
-                result['entities'] = []
-            if 'dates_mentioned' not in result:
-                result['dates_mentioned'] = []
-            
-            return result
+        Args:
+            text: Input text to analyze
             
+        Returns:
+            Dict with main_claim, key_facts, entities, and dates
+        """
+        local = self._extract_locally(text)
+        if local is not None:
+            return local
+
+        try:
+            result = self.qwen.extract_json_response(self._build_prompt(text))
+            return self._complete_result(result, text)
+        except Exception as e:
+            return self._fallback_result(text, e)
+
+    async def extract_claims_async(self, text: str) -> Dict:
+        """Async variant of extract_claims"""
+        # spaCy (loaded on first use) and dateparser are synchronous; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        local = await loop.run_in_executor(None, self._extract_locally, text)
+        if local is not None:
+            return local
+
+        try:
+            result = await self.qwen.aextract_json_response(self._build_prompt(text))
+            return self._complete_result(result, text)
         except Exception as e:
-            # Fallback: return basic structure
-            return {
-                "main_claim": text[:200] if len(text) > 200 else text,
-                "key_facts": [{"claim": text[:200], "checkable": True}],
-                "entities": [],
-                "dates_mentioned": [],
-                "error": str(e)
-            }
+            return self._fallback_result(text, e)
+
+    def _extract_locally(self, text: str) -> Optional[Dict]:
+        """
+        Fast path for short, single-sentence inputs (e.g. tweets)
+
+        The whole text is the main claim; entities come from spaCy and
+        dates from dateparser, so no Qwen round-trip is needed.
+
+        Returns:
+            Claims dict, or None if the input needs the Qwen extractor
+        """
+        text = text.strip()
+        if not text or len(text.split()) >= FAST_PATH_MAX_WORDS or _SENTENCE_BREAK_RE.search(text):
+            return None
+
+        nlp = _get_nlp()
+        if nlp is None:
+            return None
+
+        doc = nlp(text)
+        entities = list(dict.fromkeys(
+            ent.text for ent in doc.ents if ent.label_ in _ENTITY_LABELS
+        ))
+
+        dates = []
+        if search_dates is not None:
+            try:
+                found = search_dates(text, languages=["en"]) or []
+                dates = list(dict.fromkeys(date_str for date_str, _ in found))
+            except Exception:
+                pass
+
+        return {
+            "main_claim": text,
+            "key_facts": [{"claim": text, "checkable": True}],
+            "entities": entities,
+            "dates_mentioned": dates
+        }
+
+    def _build_prompt(self, text: str) -> str:
+        """Build the claim extraction prompt"""
+        return _CLAIM_PROMPT_HEAD + text + _CLAIM_PROMPT_TAIL
+
+    def _complete_result(self, result: Dict, text: str) -> Dict:
+        """Ensure required fields exist"""
+        if 'main_claim' not in result:
+            result['main_claim'] = text[:200] if len(text) > 200 else text
+        if 'key_facts' not in result:
+            result['key_facts'] = []
+        if 'entities' not in result:
+            result['entities'] = []
+        if 'dates_mentioned' not in result:
+            result['dates_mentioned'] = []
+        
+        return result
+
+    def _fallback_result(self, text: str, error: Exception) -> Dict:
+        """Fallback: return basic structure"""
+        return {
+            "main_claim": text[:200] if len(text) > 200 else text,
+            "key_facts": [{"claim": text[:200], "checkable": True}],
+            "entities": [],
+            "dates_mentioned": [],
+            "error": str(error)
+        }
@@ -4,22 +4,114 @@ Identifies missing context and provides full picture
 KEY MVP DIFFERENTIATOR
 """
 
-from modules.qwen_client import QwenClient
-from typing import Dict, List
+from modules.qwen_client import QwenClient, get_qwen_client
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+import asyncio
 import dateparser
 import re
 
 
+# Common date patterns
+DATE_PATTERNS = [
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # MM/DD/YYYY or DD-MM-YYYY
+    r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b',  # Month DD, YYYY
+    r'\b\d{4}-\d{2}-\d{2}\b',  # YYYY-MM-DD
+    r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{1,2},? \d{4}\b'
+]
+
+# All patterns fused into one alternation so text is scanned once; the
+# patterns are English-only, so ASCII \d/\b and case folding suffice
+_DATE_RE = re.compile("|".join(f"(?:{p})" for p in DATE_PATTERNS), re.IGNORECASE | re.ASCII)
+
+# Every date pattern needs at least two adjacent digits
+_DIGIT_PAIR_RE = re.compile(r'\d\d', re.ASCII)
+
+
+# Bullet (-, •, *) or number ("1." / "1") prefix of a list line
+_BULLET_RE = re.compile(r'^(?:([-•*])|\d+\.?)\s*')
+
+# Prompt templates
+_SUMMARY_PROMPT = """
+Original claim: {claim}
+
+Evidence found:
+{evidence}
+
+Analyze the claim against the evidence.
+Return as JSON with the following structure:
+
+{{
+    "missing_context": ["context point 1", "context point 2"],
+    "full_picture": "2-3 sentence summary of the full story"
+}}
+
+Important:
+- missing_context: 3-5 specific, factual points readers should know to understand the full story
+- full_picture: a brief, balanced, objective summary that gives readers the complete picture
+"""
+
+_MISSING_CONTEXT_PROMPT = """
+Original claim: {claim}
+
+Evidence found:
+{evidence}
+
+What important context is missing from the original claim? What should readers know to understand the full story?
+
+Provide 3-5 bullet points of missing context. Be specific and factual.
+Format as a simple list, one point per line, starting with a dash (-)
+"""
+
+_FULL_PICTURE_PROMPT = """
+Based on the original claim and evidence found, provide a brief, balanced summary of the full story.
+
+Original claim: {claim}
+
+Evidence: {evidence}
+{missing_section}
+Write a 2-3 sentence summary that gives readers the complete picture.
+Be objective and factual.
+"""
+
+
+@lru_cache(maxsize=1024)
+def _find_date_strings(text: str) -> Tuple[str, ...]:
+    """Return all date substrings in text, memoized per unique text"""
+    # Cheap pre-filter: skip the full alternation scan for digit-free text
+    if not _DIGIT_PAIR_RE.search(text):
+        return ()
+    return tuple(match.group() for match in _DATE_RE.finditer(text))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """Parse a matched date string, memoized per unique string"""
+    # Fast path for ISO dates before the (slow) dateparser
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        pass
+    return dateparser.parse(date_str)
+
+
 class ContextAnalyzer:
     """Analyze and restore missing context"""
     
-    def __init__(self):
-        self.qwen = QwenClient()
+    def __init__(self, qwen: Optional[QwenClient] = None):
+        # Share one client (and its connection pool) across modules by default
+        self.qwen = qwen or get_qwen_client()
     
     def analyze_context(self, claim: str, search_results: Dict) -> Dict:
         """
         Analyze what context is missing from the claim
-        
+
+        Missing context and the full picture come from a single Qwen call,
+        which runs while the timeline is built locally.
+
         Args:
             claim: The main claim to analyze
             search_results: Search results from multiple sources
@@ -27,93 +119,220 @@ class ContextAnalyzer:
         Returns:
             Dict with missing_context, full_picture, and timeline
         """
-        # Extract all evidence snippets
-        all_evidence = []
-        all_evidence.extend(search_results.get('direct_evidence', []))
-        all_evidence.extend(search_results.get('context', []))
-        all_evidence.extend(search_results.get('existing_factchecks', []))
-        
-        # Build evidence text
-        evidence_text = "\n\n".join([
-            f"Source: {ev.get('title', 'Unknown')}\n{ev.get('snippet', '')}"
-            for ev in all_evidence[:5]
-        ])
-        
-        # Extract timeline
-        timeline = self.extract_timeline(all_evidence)
-        
-        # Use Qwen to identify missing context
-        missing_context = self.identify_missing_context(claim, evidence_text)
-        
-        # Generate full picture
-        full_picture = self.generate_full_picture(claim, evidence_text, missing_context)
-        
+        all_evidence, evidence_text = self._collect_evidence(search_results)
+        if not all_evidence:
+            return self._no_evidence_result()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            summary_future = executor.submit(self.summarize_context, claim, evidence_text)
+
+            # Extract timeline while the LLM call is in flight
+            timeline = self.extract_timeline(all_evidence)
+
+            missing_context, full_picture = summary_future.result()
+
         return {
             'missing_context': missing_context,
             'full_picture': full_picture,
             'timeline': timeline,
             'evidence_count': len(all_evidence)
         }
-    
-    def identify_missing_context(self, claim: str, evidence: str) -> List[str]:
-        """Identify what context is missing"""
-        prompt = f"""
-Original claim: {claim}
 
-Evidence found:
-{evidence}
+    async def analyze_context_async(self, claim: str, search_results: Dict) -> Dict:
+        """
+        Async variant of analyze_context for use inside an event loop
 
-What important context is missing from the original claim? What should readers know to understand the full story?
+        Args:
+            claim: The main claim to analyze
+            search_results: Search results from multiple sources
 
-Provide 3-5 bullet points of missing context. Be specific and factual.
-Format as a simple list, one point per line, starting with a dash (-)
-"""
-        
+        Returns:
+            Dict with missing_context, full_picture, and timeline
+        """
+        all_evidence, evidence_text = self._collect_evidence(search_results)
+        if not all_evidence:
+            return self._no_evidence_result()
+
+        loop = asyncio.get_running_loop()
+
+        (missing_context, full_picture), timeline = await asyncio.gather(
+            self.summarize_context_async(claim, evidence_text),
+            loop.run_in_executor(None, self.extract_timeline, all_evidence)
+        )
+
+        return {
+            'missing_context': missing_context,
+            'full_picture': full_picture,
+            'timeline': timeline,
+            'evidence_count': len(all_evidence)
+        }
+
+    def _no_evidence_result(self) -> Dict:
+        """Constant result when search found nothing (no Qwen calls needed)"""
+        return {
+            'missing_context': [],
+            'full_picture': 'Insufficient evidence to verify.',
+            'timeline': [],
+            'evidence_count': 0
+        }
+
+    def summarize_context(self, claim: str, evidence: str) -> Tuple[List[str], str]:
+        """
+        Get missing context and full picture in one Qwen request
+
+        Falls back to the separate (concurrent) prompts if the combined
+        JSON response cannot be used.
+
+        Args:
+            claim: The main claim to analyze
+            evidence: Evidence text built from search results
+
+        Returns:
+            Tuple of (missing_context, full_picture)
+        """
         try:
-            response = self.qwen.simple_prompt(prompt)
-            
-            # Parse bullet points
-            lines = response.strip().split('\n')
-            context_points = []
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                    point = line[1:].strip()
-                    if point:
-                        context_points.append(point)
-                elif line and len(context_points) < 5:
-                    # Include numbered points or regular lines
-                    clean_line = re.sub(r'^\d+\.?\s*', '', line)
-                    if clean_line:
-                        context_points.append(clean_line)
-            
-            return context_points[:5]
-            
+            result = self.qwen.extract_json_response(self._summary_prompt(claim, evidence))
+            return self._parse_summary(result)
+        except Exception:
+            return self._summarize_separately(claim, evidence)
+
+    async def summarize_context_async(self, claim: str, evidence: str) -> Tuple[List[str], str]:
+        """Async variant of summarize_context"""
+        try:
+            result = await self.qwen.aextract_json_response(self._summary_prompt(claim, evidence))
+            return self._parse_summary(result)
+        except Exception:
+            missing_context, full_picture = await asyncio.gather(
+                self.identify_missing_context_async(claim, evidence),
+                self.generate_full_picture_async(claim, evidence)
+            )
+            return missing_context, full_picture
+
+    def _summary_prompt(self, claim: str, evidence: str) -> str:
+        """Build the combined missing-context / full-picture prompt"""
+        return _SUMMARY_PROMPT.format(claim=claim, evidence=evidence)
+
+    def _parse_summary(self, result: Dict) -> Tuple[List[str], str]:
+        """Validate the combined context JSON"""
+        missing_context = result.get('missing_context')
+        full_picture = result.get('full_picture')
+        if isinstance(missing_context, str):
+            missing_context = [missing_context]
+        if not isinstance(missing_context, list) or not isinstance(full_picture, str):
+            raise ValueError("Combined context response is missing required fields")
+
+        missing_context = [str(point).strip() for point in missing_context if str(point).strip()]
+        return missing_context[:5], full_picture.strip()
+
+    def _summarize_separately(self, claim: str, evidence: str) -> Tuple[List[str], str]:
+        """Run the missing-context and full-picture prompts concurrently"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            missing_future = executor.submit(self.identify_missing_context, claim, evidence)
+            picture_future = executor.submit(self.generate_full_picture, claim, evidence)
+            return missing_future.result(), picture_future.result()
+
+    def _collect_evidence(self, search_results: Dict) -> Tuple[List[Dict], str]:
+        """Combine evidence lists and build the prompt evidence text"""
+        all_evidence = []
+        top = []
+
+        # Single pass: collect all evidence and format the first five snippets
+        for ev in chain(
+            search_results.get('direct_evidence', ()),
+            search_results.get('context', ()),
+            search_results.get('existing_factchecks', ())
+        ):
+            all_evidence.append(ev)
+            if len(top) < 5:
+                top.append(f"Source: {ev.get('title', 'Unknown')}\n{ev.get('snippet', '')}")
+
+        return all_evidence, "\n\n".join(top)
+    
+    def identify_missing_context(self, claim: str, evidence: str) -> List[str]:
+        """Identify what context is missing"""
+        try:
+            response = self.qwen.simple_prompt(self._missing_context_prompt(claim, evidence))
+            return self._parse_context_points(response)
         except Exception as e:
             return [f"Unable to analyze context: {str(e)}"]
-    
-    def generate_full_picture(self, claim: str, evidence: str, missing_context: List[str]) -> str:
-        """Generate a comprehensive summary"""
-        prompt = f"""
-Based on the original claim and evidence found, provide a brief, balanced summary of the full story.
 
-Original claim: {claim}
-
-Evidence: {evidence}
+    async def identify_missing_context_async(self, claim: str, evidence: str) -> List[str]:
+        """Async variant of identify_missing_context"""
+        try:
+            response = await self.qwen.asimple_prompt(self._missing_context_prompt(claim, evidence))
+            return self._parse_context_points(response)
+        except Exception as e:
+            return [f"Unable to analyze context: {str(e)}"]
 
-Missing context identified:
-{chr(10).join(f"- {point}" for point in missing_context)}
+    def _missing_context_prompt(self, claim: str, evidence: str) -> str:
+        """Build the missing-context prompt"""
+        return _MISSING_CONTEXT_PROMPT.format(claim=claim, evidence=evidence)
 
-Write a 2-3 sentence summary that gives readers the complete picture.
-Be objective and factual.
-"""
+    def _parse_context_points(self, response: str) -> List[str]:
+        """Parse bullet points from a missing-context response"""
+        lines = response.strip().split('\n')
+        context_points = []
+        
+        for line in lines:
+            line = line.strip()
+            prefix = _BULLET_RE.match(line)
+            if prefix and prefix.group(1):
+                # Bulleted point (-, •, *)
+                point = line[prefix.end():]
+                if point:
+                    context_points.append(point)
+            elif line and len(context_points) < 5:
+                # Include numbered points or regular lines
+                clean_line = line[prefix.end():] if prefix else line
+                if clean_line:
+                    context_points.append(clean_line)
         
+        return context_points[:5]
+    
+    def generate_full_picture(
+        self,
+        claim: str,
+        evidence: str,
+        missing_context: Optional[List[str]] = None
+    ) -> str:
+        """Generate a comprehensive summary"""
         try:
-            response = self.qwen.simple_prompt(prompt)
+            response = self.qwen.simple_prompt(self._full_picture_prompt(claim, evidence, missing_context))
             return response.strip()
         except Exception as e:
             return f"Unable to generate full picture: {str(e)}"
+
+    async def generate_full_picture_async(
+        self,
+        claim: str,
+        evidence: str,
+        missing_context: Optional[List[str]] = None
+    ) -> str:
+        """Async variant of generate_full_picture"""
+        try:
+            response = await self.qwen.asimple_prompt(self._full_picture_prompt(claim, evidence, missing_context))
+            return response.strip()
+        except Exception as e:
+            return f"Unable to generate full picture: {str(e)}"
+
+    def _full_picture_prompt(
+        self,
+        claim: str,
+        evidence: str,
+        missing_context: Optional[List[str]] = None
+    ) -> str:
+        """Build the full-picture prompt"""
+        missing_section = ""
+        if missing_context:
+            missing_section = "\nMissing context identified:\n" + "\n".join(
+                f"- {point}" for point in missing_context
+            ) + "\n"
+
+        return _FULL_PICTURE_PROMPT.format(
+            claim=claim,
+            evidence=evidence,
+            missing_section=missing_section
+        )
     
     def extract_timeline(self, evidence: List[Dict]) -> List[Dict]:
         """Extract timeline events from evidence"""
@@ -142,23 +361,12 @@ Be objective and factual.
         """Extract dates from text"""
         dates = []
         
-        # Common date patterns
-        date_patterns = [
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # MM/DD/YYYY or DD-MM-YYYY
-            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b',  # Month DD, YYYY
-            r'\b\d{4}-\d{2}-\d{2}\b',  # YYYY-MM-DD
-            r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{1,2},? \d{4}\b'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                date_str = match.group()
-                try:
-                    date_obj = dateparser.parse(date_str)
-                    if date_obj:
-                        dates.append((date_str, date_obj))
-                except:
-                    continue
+        for date_str in _find_date_strings(text):
+            try:
+                date_obj = _parse_date(date_str)
+                if date_obj:
+                    dates.append((date_str, date_obj))
+            except:
+                continue
         
         return dates
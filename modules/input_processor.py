@@ -3,13 +3,92 @@ Input Processor Module
 Handles text, URL, and image inputs
 """
 
+import asyncio
+import threading
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pytesseract
-from PIL import Image
+from PIL import Image, ImageOps
 from newspaper import Article
-from typing import Dict
+from typing import Callable, Dict, Optional, Union
+import io
 import os
+import re
+
+from modules.url_cache import UrlCache
+
+# Fast C-based HTML parser; BeautifulSoup is kept as a last resort
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Long-edge limit for images sent to OCR / Qwen-VL; OCR time scales with pixel count
+_IMAGE_MAX_SIDE = 1600
+
+# LSTM engine, single uniform block of text
+_TESSERACT_CONFIG = '--oem 1 --psm 6'
+
+# Shared HTTP clients (pooled connections), created on first use
+_session = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Return the module-level requests.Session used by the sync URL path"""
+    global _session
+    with _client_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = _USER_AGENT
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 502, 503, 504),
+                    allowed_methods=frozenset(['GET'])
+                )
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the module-level httpx.AsyncClient"""
+    global _async_client
+    with _client_lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                http2=True,
+                timeout=10,
+                follow_redirects=True,
+                headers={'User-Agent': _USER_AGENT}
+            )
+        return _async_client
+
+
+async def close_async_client():
+    """Close the shared httpx.AsyncClient"""
+    global _async_client
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
 
 
 class SimpleInputProcessor:
@@ -25,6 +104,9 @@ class SimpleInputProcessor:
         """
         self.use_vision_api = use_vision_api
 
+        # Persistent cache of processed URLs (set URL_CACHE_ENABLED=0 to bypass)
+        self.url_cache = UrlCache.from_env()
+
         # Only import vision client if needed
         if self.use_vision_api:
             try:
@@ -45,7 +127,7 @@ class SimpleInputProcessor:
         Process input based on type
         
         Args:
-            input_data: The input (text, URL, or file path)
+            input_data: The input (text, URL, or image file path / bytes)
             input_type: One of 'text', 'url', 'image'
             
         Returns:
@@ -59,6 +141,24 @@ class SimpleInputProcessor:
             return self._process_text(input_data)
         else:
             raise ValueError(f"Unknown input type: {input_type}")
+
+    async def process_async(self, input_data, input_type: str) -> Dict:
+        """
+        Async variant of process; network and OCR work runs off the event loop
+
+        Args:
+            input_data: The input (text, URL, or image file path / bytes)
+            input_type: One of 'text', 'url', 'image'
+
+        Returns:
+            Dict with processed text and metadata
+        """
+        if input_type == "url":
+            return await self._process_url_async(input_data)
+        elif input_type == "image":
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._process_image, input_data)
+        return self.process(input_data, input_type)
     
     def _process_text(self, text: str) -> Dict:
         """Process direct text input"""
@@ -68,22 +168,68 @@ class SimpleInputProcessor:
             "has_image": False
         }
     
-    def _process_image(self, image_path: str) -> Dict:
-        """Extract text from image using Qwen Vision API or OCR"""
+    async def extract_image_text_async(self, image: Union[str, bytes]) -> str:
+        """
+        Return an image's visible text as soon as it is available
+
+        With the Qwen Vision API, this resolves once the streamed response
+        has closed its visible_text field; the rest of the analysis keeps
+        streaming in the background.
+
+        Args:
+            image: Path to an image file, or the raw image bytes
+
+        Returns:
+            Extracted text (empty if extraction failed)
+        """
+        loop = asyncio.get_running_loop()
+        text_ready = loop.create_future()
+
+        def set_text(text: str):
+            if not text_ready.done():
+                text_ready.set_result(text)
+
+        def on_text(text: str):
+            loop.call_soon_threadsafe(set_text, text)
+
+        task = loop.run_in_executor(None, self._process_image, image, on_text)
+        # Keep a late failure of the background analysis from going unobserved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        await asyncio.wait({task, text_ready}, return_when=asyncio.FIRST_COMPLETED)
+        if text_ready.done():
+            return text_ready.result()
+        return task.result()['text']
+
+    def _process_image(
+        self,
+        image: Union[str, bytes],
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """
+        Extract text from image using Qwen Vision API or OCR
+
+        Args:
+            image: Path to an image file, or the raw image bytes
+            on_text: Optional callback for the vision text, called before
+                     the full vision analysis completes
+        """
+        source = image if isinstance(image, str) else "upload"
 
         # Method 1: Use Qwen Vision API (recommended - more accurate)
         if self.use_vision_api and self.vision_client:
             try:
-                print(f"Using Qwen Vision API to analyze image: {image_path}")
+                print(f"Using Qwen Vision API to analyze image: {source}")
 
                 # Extract claims using Qwen Vision
-                result = self.vision_client.extract_claims_from_image(image_path)
+                # Downscale before upload to cut request size
+                result = self.vision_client.extract_claims_from_bytes(self._shrink_image(image), on_text=on_text)
 
                 return {
                     "text": result.get('visible_text', ''),
                     "type": "image",
                     "has_image": True,
-                    "source": image_path,
+                    "source": source,
                     "image_description": result.get('image_description', ''),
                     "vision_extracted": True,
                     "raw_vision_data": result  # Include full vision analysis
@@ -113,26 +259,28 @@ class SimpleInputProcessor:
 
                 # Try to fall back to OCR if vision fails
                 print("Falling back to local OCR...")
-                return self._process_image_with_ocr(image_path)
+                return self._process_image_with_ocr(image)
 
         # Method 2: Use local OCR (Tesseract)
         else:
-            return self._process_image_with_ocr(image_path)
+            return self._process_image_with_ocr(image)
 
-    def _process_image_with_ocr(self, image_path: str) -> Dict:
+    def _process_image_with_ocr(self, image: Union[str, bytes]) -> Dict:
         """Extract text from image using local OCR (Tesseract)"""
+        source = image if isinstance(image, str) else "upload"
         try:
-            print(f"Using Tesseract OCR to extract text from: {image_path}")
+            print(f"Using Tesseract OCR to extract text from: {source}")
 
-            # Open image and extract text
-            img = Image.open(image_path)
-            text = pytesseract.image_to_string(img)
+            # Open image (from disk or memory) and extract text
+            img = Image.open(image if isinstance(image, str) else io.BytesIO(image))
+            img = self._prepare_for_ocr(img)
+            text = pytesseract.image_to_string(img, config=_TESSERACT_CONFIG)
 
             return {
                 "text": text.strip(),
                 "type": "image",
                 "has_image": True,
-                "source": image_path,
+                "source": source,
                 "vision_extracted": False
             }
         except Exception as e:
@@ -145,57 +293,152 @@ class SimpleInputProcessor:
                 "error_type": "ocr_failed"
             }
     
+    def _prepare_for_ocr(self, img: Image.Image) -> Image.Image:
+        """Downscale and convert an image to grayscale for Tesseract"""
+        # Let the JPEG decoder skip detail we would discard anyway (no-op for other formats)
+        img.draft('L', (_IMAGE_MAX_SIDE, _IMAGE_MAX_SIDE))
+        # Rotate phone photos upright; Tesseract ignores the EXIF orientation tag
+        img = ImageOps.exif_transpose(img).convert('L')
+        img.thumbnail((_IMAGE_MAX_SIDE, _IMAGE_MAX_SIDE), Image.LANCZOS)
+        return img
+
+    def _shrink_image(self, image: Union[str, bytes]) -> bytes:
+        """
+        Return image bytes with the long edge capped at _IMAGE_MAX_SIDE
+
+        Images already within the limit are returned unchanged.
+
+        Args:
+            image: Path to an image file, or the raw image bytes
+        """
+        if isinstance(image, str):
+            with open(image, 'rb') as f:
+                data = f.read()
+        else:
+            data = bytes(image)
+
+        img = Image.open(io.BytesIO(data))
+        if max(img.size) <= _IMAGE_MAX_SIDE:
+            return data
+
+        fmt = img.format if img.format in ('JPEG', 'PNG', 'WEBP') else 'PNG'
+        img.draft('RGB', (_IMAGE_MAX_SIDE, _IMAGE_MAX_SIDE))
+        # Re-encoding drops the EXIF orientation tag, so apply it to the pixels first
+        img = ImageOps.exif_transpose(img)
+        if fmt == 'JPEG' and img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        img.thumbnail((_IMAGE_MAX_SIDE, _IMAGE_MAX_SIDE), Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        img.save(buffer, format=fmt, **({'quality': 90} if fmt == 'JPEG' else {}))
+        return buffer.getvalue()
+
     def _process_url(self, url: str) -> Dict:
         """Scrape and extract article text from URL"""
+        entry = self.url_cache.get(url)
+        if self.url_cache.is_fresh(entry):
+            return entry['result']
+
         try:
-            # Try newspaper3k first (better for articles)
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            text = article.text
-            title = article.title
-            
-            # Limit text length for MVP
-            if len(text) > 5000:
-                text = text[:5000] + "..."
-            
-            return {
-                "text": text,
-                "title": title,
-                "type": "article",
-                "source": url,
-                "has_image": False
-            }
+            headers = self.url_cache.validators(entry)
+            response = _get_session().get(url, timeout=10, headers=headers)
+
+            # Unchanged since last fetch: reuse the cached parse
+            if response.status_code == 304 and entry:
+                self.url_cache.touch(url, entry)
+                return entry['result']
+
+            result = self._parse_html(url, response.text)
+            if response.status_code == 200:
+                self.url_cache.store(url, result, response.headers)
+            return result
         except Exception as e:
-            # Fallback to simple BeautifulSoup scraping
-            try:
-                response = requests.get(url, timeout=10, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text
-                text = soup.get_text()
-                
-                # Clean up whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                # Limit text length
-                if len(text) > 5000:
-                    text = text[:5000] + "..."
-                
-                return {
-                    "text": text,
-                    "type": "article",
-                    "source": url,
-                    "has_image": False
-                }
-            except Exception as fallback_error:
-                raise Exception(f"Failed to process URL: {str(fallback_error)}")
+            raise Exception(f"Failed to process URL: {str(e)}")
+
+    async def _process_url_async(self, url: str) -> Dict:
+        """Async variant of _process_url using the shared httpx client"""
+        entry = self.url_cache.get(url)
+        if self.url_cache.is_fresh(entry):
+            return entry['result']
+
+        try:
+            response = await _get_async_client().get(url, headers=self.url_cache.validators(entry))
+
+            if response.status_code == 304 and entry:
+                self.url_cache.touch(url, entry)
+                return entry['result']
+
+            # newspaper3k parsing is CPU-bound, so run it in a worker thread
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self._parse_html, url, response.text)
+            if response.status_code == 200:
+                self.url_cache.store(url, result, response.headers)
+            return result
+        except Exception as e:
+            raise Exception(f"Failed to process URL: {str(e)}")
+
+    def _parse_html(self, url: str, html: str) -> Dict:
+        """Extract the article from fetched HTML"""
+        try:
+            # Try newspaper3k first (better for articles)
+            return self._parse_article(url, html)
+        except Exception:
+            # Fallback to simple HTML scraping
+            return self._scraped_result(url, html)
+
+    def _parse_article(self, url: str, html: str) -> Dict:
+        """Parse an article with newspaper3k from already-downloaded HTML"""
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()
+        
+        text = article.text
+        title = article.title
+        if not text:
+            raise ValueError("newspaper3k found no article text")
+        
+        # Limit text length for MVP
+        if len(text) > 5000:
+            text = text[:5000] + "..."
+        
+        return {
+            "text": text,
+            "title": title,
+            "type": "article",
+            "source": url,
+            "has_image": False
+        }
+
+    def _scraped_result(self, url: str, html: str) -> Dict:
+        """Build the result dict from raw HTML"""
+        text = self._html_to_text(html)
+        
+        # Limit text length
+        if len(text) > 5000:
+            text = text[:5000] + "..."
+        
+        return {
+            "text": text,
+            "type": "article",
+            "source": url,
+            "has_image": False
+        }
+
+    def _html_to_text(self, html: str) -> str:
+        """Extract visible text from HTML, dropping scripts and styles"""
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            for tag in tree.css('script, style'):
+                tag.decompose()
+            root = tree.body or tree.root
+            text = root.text(separator=' ', strip=True) if root is not None else ''
+        elif BeautifulSoup is not None:
+            soup = BeautifulSoup(html, 'lxml')
+            for script in soup(["script", "style"]):
+                script.decompose()
+            text = soup.get_text(separator=' ')
+        else:
+            raise ImportError("Install selectolax or beautifulsoup4 to scrape URLs")
+
+        # Clean up whitespace
+        return _WHITESPACE_RE.sub(' ', text).strip()
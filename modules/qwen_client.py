@@ -5,14 +5,31 @@ Handles all interactions with Qwen API via DashScope
 
 import os
 import json
+import asyncio
+import threading
 from typing import Dict, List, Optional
+import aiohttp
+import orjson
 import dashscope
 from dashscope import Generation
 import urllib3
 
+from modules.response_cache import cached_response, get_response_cache
+
 # Disable SSL warnings for development/testing
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Structured output mode for the OpenAI-compatible / DashScope APIs
+JSON_MODE = {"type": "json_object"}
+
+
+def _loads(text: str):
+    """Decode JSON with orjson, falling back to stdlib json (e.g. for NaN)"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
 
 class QwenClient:
     """Client for Alibaba Qwen 3 LLM"""
@@ -24,28 +41,53 @@ class QwenClient:
         
         dashscope.api_key = self.api_key
         self.model = "qwen-plus"  # Using Qwen-Plus for better performance
+
+        # Shared exact/semantic response cache (set QWEN_CACHE_ENABLED=0 to bypass)
+        if os.getenv("QWEN_CACHE_ENABLED", "1") == "1":
+            self.cache = get_response_cache()
+        else:
+            self.cache = None
+
+        # Async client settings (OpenAI-compatible DashScope endpoint)
+        self.base_url = os.getenv(
+            "DASHSCOPE_BASE_URL",
+            "https://dashscope.aliyuncs.com/compatible-mode/v1"
+        ).rstrip("/")
+        self.max_concurrency = int(os.getenv("QWEN_MAX_CONCURRENCY", 8))
+        self.max_retries = 3
+
+        # Created lazily inside the running event loop
+        self._session = None
+        self._semaphore = None
+        self._loop = None
         
-    def chat(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+    @cached_response
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        response_format: Optional[Dict] = None
+    ) -> str:
         """
         Send a chat completion request to Qwen
         
         Args:
             messages: List of message dicts with 'role' and 'content'
             temperature: Sampling temperature (0-1)
+            response_format: Optional structured output mode,
+                             e.g. {"type": "json_object"}
             
         Returns:
             Response text from Qwen
         """
+        extra = {'response_format': response_format} if response_format else {}
         try:
-            # Configure session to ignore SSL verification for testing
-            import os
-            os.environ['CURL_CA_BUNDLE'] = ''
-            
             response = Generation.call(
                 model=self.model,
                 messages=messages,
                 result_format='message',
-                temperature=temperature
+                temperature=temperature,
+                **extra
             )
             
             if response.status_code == 200:
@@ -60,18 +102,127 @@ class QwenClient:
                 raise Exception(f"SSL Certificate Error - Please check network or disable SSL verification: {error_msg}")
             raise Exception(f"Failed to call Qwen API: {str(e)}")
     
-    def extract_json_response(self, prompt: str, temperature: float = 0.3) -> dict:
+    async def _get_async_resources(self):
+        """Return the shared aiohttp session and semaphore for the current loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session is bound to the loop it was created on; close the old one
+            await self._release_session()
+        # Another task may have created the session while the old one closed
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                timeout=aiohttp.ClientTimeout(total=120)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session, self._semaphore
+
+    @cached_response
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        response_format: Optional[Dict] = None
+    ) -> str:
         """
-        Get a JSON response from Qwen
+        Async chat completion request to Qwen
+
+        Uses a shared aiohttp session; at most QWEN_MAX_CONCURRENCY requests
+        are in flight at once. 429/5xx responses, connection errors and
+        timeouts are retried with exponential backoff.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0-1)
+            response_format: Optional structured output mode,
+                             e.g. {"type": "json_object"}
+
+        Returns:
+            Response text from Qwen
+        """
+        session, semaphore = await self._get_async_resources()
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature
+        }
+        if response_format:
+            payload["response_format"] = response_format
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with semaphore:
+                        async with session.post(f"{self.base_url}/chat/completions", json=payload) as response:
+                            if response.status == 200:
+                                data = await response.json()
+                                return data["choices"][0]["message"]["content"]
+
+                            body = await response.text()
+                            retryable = response.status == 429 or response.status >= 500
+                            error = Exception(f"Qwen API error: {response.status} - {body[:500]}")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    retryable = True
+                    error = e
+
+                if not retryable or attempt == self.max_retries:
+                    raise error
+                # Back off outside the semaphore so queued requests can use the slot
+                await asyncio.sleep(2 ** attempt)
+
+        except Exception as e:
+            error_msg = str(e)
+            if 'SSL' in error_msg or 'CERTIFICATE' in error_msg:
+                raise Exception(f"SSL Certificate Error - Please check network or disable SSL verification: {error_msg}")
+            raise Exception(f"Failed to call Qwen API: {str(e)}")
+
+    async def aclose(self):
+        """Close the shared aiohttp session"""
+        await self._release_session()
+
+    async def _release_session(self):
+        """Close the shared aiohttp session on whichever event loop created it"""
+        session, loop = self._session, self._loop
+        self._session = None
+        if session is None or session.closed:
+            return
+        if loop is None or loop.is_closed() or loop is asyncio.get_running_loop():
+            # On a closed loop the connections are already gone; this only
+            # marks the session closed so it doesn't warn when collected
+            await session.close()
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            loop.create_task(session.close())
+
+    def extract_json_response(self, prompt: str, temperature: float = 0.0) -> dict:
+        """
+        Get a JSON response from Qwen using JSON mode
         
         Args:
             prompt: The prompt requesting JSON output
-            temperature: Lower temperature for more consistent JSON
+            temperature: Sampling temperature (0 for deterministic output)
             
         Returns:
             Parsed JSON dict
         """
-        messages = [
+        response_text = self.chat(self._json_messages(prompt), temperature, response_format=JSON_MODE)
+        return self.parse_json_response(response_text)
+
+    async def aextract_json_response(self, prompt: str, temperature: float = 0.0) -> dict:
+        """Async variant of extract_json_response"""
+        response_text = await self.achat(self._json_messages(prompt), temperature, response_format=JSON_MODE)
+        return self.parse_json_response(response_text)
+
+    @staticmethod
+    def _json_messages(prompt: str) -> List[Dict[str, str]]:
+        """Build messages for a JSON-only request"""
+        return [
             {
                 "role": "system",
                 "content": "You are a helpful assistant that always responds with valid JSON."
@@ -81,25 +232,27 @@ class QwenClient:
                 "content": prompt
             }
         ]
-        
-        response_text = self.chat(messages, temperature)
-        
-        # Try to extract JSON from response
+
+    @staticmethod
+    def parse_json_response(response_text: str) -> dict:
+        """
+        Parse a JSON-mode response into a dict
+
+        Args:
+            response_text: Raw response text (a JSON object in JSON mode)
+
+        Returns:
+            Parsed JSON dict
+        """
         try:
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # Try to find JSON in the response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            result = _loads(response_text)
+        except (json.JSONDecodeError, TypeError):
+            # TypeError: no text at all, e.g. a None message content
             raise ValueError(f"Could not parse JSON from response: {response_text}")
+
+        if not isinstance(result, dict):
+            raise ValueError(f"Expected a JSON object, got: {response_text}")
+        return result
     
     def simple_prompt(self, prompt: str, system_message: Optional[str] = None) -> str:
         """
@@ -112,6 +265,15 @@ class QwenClient:
         Returns:
             Response text
         """
+        return self.chat(self._prompt_messages(prompt, system_message))
+
+    async def asimple_prompt(self, prompt: str, system_message: Optional[str] = None) -> str:
+        """Async variant of simple_prompt"""
+        return await self.achat(self._prompt_messages(prompt, system_message))
+
+    @staticmethod
+    def _prompt_messages(prompt: str, system_message: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build messages for a prompt with optional system message"""
         messages = []
         
         if system_message:
@@ -125,4 +287,17 @@ class QwenClient:
             "content": prompt
         })
         
-        return self.chat(messages)
+        return messages
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_qwen_client() -> QwenClient:
+    """Return the process-wide QwenClient, creating it on first use"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = QwenClient()
+        return _shared_client
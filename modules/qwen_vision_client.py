@@ -6,11 +6,164 @@ Handles image + text multimodal inputs using Qwen-VL models
 import os
 import json
 import base64
-from typing import Dict, List, Optional, Union
-import dashscope
-from dashscope import MultiModalConversation
+import hashlib
+import re
+from functools import cached_property, lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+import orjson
 from http import HTTPStatus
 
+from modules.vision_cache import VisionCache
+
+
+CLAIMS_PROMPT = """
+Analyze this image and extract any factual claims or text visible in it.
+Return as JSON with the following structure:
+
+{
+    "visible_text": "all text you can see in the image",
+    "main_claim": "primary claim being made",
+    "key_facts": [
+        {"claim": "specific fact 1", "checkable": true},
+        {"claim": "specific fact 2", "checkable": false}
+    ],
+    "entities": ["person1", "organization1", "location1"],
+    "dates_mentioned": ["date1", "date2"],
+    "image_description": "brief description of what the image shows"
+}
+
+Important:
+- Extract ALL visible text accurately
+- Identify verifiable factual claims
+- Note any named entities (people, organizations, places)
+- Extract any dates or time references
+- Describe the image content briefly
+"""
+
+# Cache keys include the prompt, so editing CLAIMS_PROMPT invalidates old entries
+CLAIMS_PROMPT_VERSION = hashlib.sha256(CLAIMS_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+_UNPARSED_DESCRIPTION = "Could not parse structured response"
+
+# Several questions about one image, asked in a single request
+BATCH_PROMPT_HEADER = """
+Answer each of the following {count} questions about this image.
+Start each answer on its own line with the marker "### Answer N" (N is the
+question number), followed by the answer. Do not add any other text.
+"""
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# "### Answer N" marker; models often continue the answer on the same line
+# ("### Answer 2: Yes"), so the answer is everything up to the next marker
+_BATCH_ANSWER_RE = re.compile(r'^#{2,}[ \t]*Answer[ \t]+(\d+)[ \t]*[:.)-]?\s*', re.MULTILINE | re.IGNORECASE)
+
+
+# Multiple of 3 bytes, so each chunk encodes without base64 padding
+_BASE64_CHUNK_SIZE = 4096 * 3
+
+
+@lru_cache(maxsize=32)
+def _load_image_file(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    """
+    Read an image file once, returning (base64 data, sha256 hex digest)
+
+    The file is read in chunks that are hashed and base64-encoded in the
+    same pass. Results are memoized per (path, mtime, size), so a changed
+    file is re-read automatically.
+    """
+    parts = []
+    digest = hashlib.sha256()
+    with open(path, 'rb') as image_file:
+        for chunk in iter(lambda: image_file.read(_BASE64_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            parts.append(base64.b64encode(chunk).decode('ascii'))
+    return ''.join(parts), digest.hexdigest()
+
+
+def _load_image(image_path: str) -> Tuple[str, str]:
+    """Memoized (base64 data, sha256 hex digest) for an image file"""
+    stat = os.stat(image_path)
+    return _load_image_file(os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+
+
+class _StringFieldScanner:
+    """
+    Watch a growing JSON buffer for one string field to be closed
+
+    Each feed() resumes where the previous one stopped, so following a
+    streamed response costs one pass over it rather than a rescan of the
+    whole buffer per chunk.
+    """
+
+    def __init__(self, field: str):
+        self._key_re = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._search_from = 0     # where the next key search starts
+        self._value_start = None  # index of the value's opening quote
+        self._pos = 0             # next value character to scan
+        self._escaped = False
+        self._closed = False
+        self._value = None
+
+    def feed(self, buffer: str) -> Optional[str]:
+        """
+        Scan the text appended to buffer since the last call
+
+        Args:
+            buffer: JSON text received so far; each call must extend the last
+
+        Returns:
+            The decoded string, or None if the field is absent or still open
+        """
+        if self._closed:
+            return self._value
+
+        if self._value_start is None:
+            match = self._key_re.search(buffer, self._search_from)
+            if not match:
+                # A key cut off at the end of the buffer holds at most its own
+                # two quotes so far, so the next search resumes at the
+                # second-to-last quote
+                last = buffer.rfind('"', self._search_from)
+                if last < 0:
+                    self._search_from = len(buffer)
+                else:
+                    before = buffer.rfind('"', self._search_from, last)
+                    self._search_from = before if before >= 0 else last
+                return None
+            self._value_start = match.end() - 1
+            self._pos = match.end()
+
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._escaped:
+                self._escaped = False
+            elif char == '\\':
+                self._escaped = True
+            elif char == '"':
+                self._closed = True
+                try:
+                    self._value = json.loads(buffer[self._value_start:i + 1])
+                except json.JSONDecodeError:
+                    self._value = None
+                return self._value
+        self._pos = len(buffer)
+        return None
+
+
+def _completed_string_field(partial_json: str, field: str) -> Optional[str]:
+    """
+    Return the value of a string field from partial JSON once it is closed
+
+    Args:
+        partial_json: JSON text received so far (may be incomplete)
+        field: Name of the string field to look for
+
+    Returns:
+        The decoded string, or None if the field is absent or still open
+    """
+    return _StringFieldScanner(field).feed(partial_json)
+
 
 class QwenVisionClient:
     """Client for Alibaba Qwen Vision (VL) models"""
@@ -20,12 +173,22 @@ class QwenVisionClient:
         if not self.api_key:
             raise ValueError("DASHSCOPE_API_KEY not found in environment variables")
 
-        dashscope.api_key = self.api_key
-
         # Use qwen-vl-plus for vision tasks (supports images)
         # Options: qwen-vl-plus, qwen-vl-max
         self.model = "qwen-vl-plus"
 
+        # Content-addressed cache of claim extractions (VISION_CACHE_ENABLED=0 to bypass)
+        self.cache = VisionCache.from_env()
+
+    @cached_property
+    def _mmc(self):
+        """DashScope MultiModalConversation, imported on first use"""
+        import dashscope
+        from dashscope import MultiModalConversation
+
+        dashscope.api_key = self.api_key
+        return MultiModalConversation
+
     def encode_image_to_base64(self, image_path: str) -> str:
         """
         Encode image file to base64 string
@@ -36,8 +199,7 @@ class QwenVisionClient:
         Returns:
             Base64 encoded string
         """
-        with open(image_path, 'rb') as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        return _load_image(image_path)[0]
 
     def analyze_image_with_text(
         self,
@@ -56,30 +218,30 @@ class QwenVisionClient:
         Returns:
             Response text from Qwen-VL
         """
+        return "".join(self.stream_image_with_text(image_path, prompt, temperature))
+
+    def stream_image_with_text(
+        self,
+        image_path: str,
+        prompt: str,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Stream a Qwen-VL analysis of a local image as text chunks
+
+        Args:
+            image_path: Path to the image file
+            prompt: Text prompt/question about the image
+            temperature: Sampling temperature (0-1)
+
+        Yields:
+            Incremental response text from Qwen-VL
+        """
+        # Local file path (recommended for local files)
+        messages = self._image_messages(f"file://{os.path.abspath(image_path)}", prompt)
+
         try:
-            # Method 1: Using local file path (recommended for local files)
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"image": f"file://{os.path.abspath(image_path)}"},
-                        {"text": prompt}
-                    ]
-                }
-            ]
-
-            response = MultiModalConversation.call(
-                model=self.model,
-                messages=messages,
-                temperature=temperature
-            )
-
-            if response.status_code == HTTPStatus.OK:
-                return response.output.choices[0].message.content[0]['text']
-            else:
-                # Provide detailed error information
-                error_msg = f"Qwen-VL API error: {response.code} - {response.message}"
-                raise Exception(error_msg)
+            yield from self._stream(messages, temperature)
 
         except Exception as e:
             error_str = str(e)
@@ -121,107 +283,202 @@ class QwenVisionClient:
         Returns:
             Response text from Qwen-VL
         """
-        try:
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"image": f"data:image;base64,{image_base64}"},
-                        {"text": prompt}
-                    ]
-                }
-            ]
-
-            response = MultiModalConversation.call(
-                model=self.model,
-                messages=messages,
-                temperature=temperature
-            )
-
-            if response.status_code == HTTPStatus.OK:
-                return response.output.choices[0].message.content[0]['text']
-            else:
-                error_msg = f"Qwen-VL API error: {response.code} - {response.message}"
-                raise Exception(error_msg)
+        return "".join(self.stream_image_with_base64(image_base64, prompt, temperature))
 
+    def stream_image_with_base64(
+        self,
+        image_base64: str,
+        prompt: str,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Stream a Qwen-VL analysis of base64 encoded image data
+
+        Args:
+            image_base64: Base64 encoded image data
+            prompt: Text prompt/question about the image
+            temperature: Sampling temperature (0-1)
+
+        Yields:
+            Incremental response text from Qwen-VL
+        """
+        messages = self._image_messages(f"data:image;base64,{image_base64}", prompt)
+
+        try:
+            yield from self._stream(messages, temperature)
         except Exception as e:
             raise Exception(f"Failed to call Qwen-VL API: {str(e)}")
 
-    def extract_claims_from_image(self, image_path: str) -> Dict:
+    @staticmethod
+    def _image_messages(image: str, prompt: str) -> List[Dict]:
+        """Build a single-turn image + text message list"""
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"image": image},
+                    {"text": prompt}
+                ]
+            }
+        ]
+
+    def _stream(self, messages: List[Dict], temperature: float) -> Iterator[str]:
+        """Call Qwen-VL in streaming mode and yield text deltas"""
+        responses = self._mmc.call(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            incremental_output=True
+        )
+
+        for response in responses:
+            if response.status_code != HTTPStatus.OK:
+                # Provide detailed error information
+                raise Exception(f"Qwen-VL API error: {response.code} - {response.message}")
+
+            for part in response.output.choices[0].message.content or []:
+                text = part.get('text')
+                if text:
+                    yield text
+
+    def extract_claims_from_image(
+        self,
+        image_path: str,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict:
         """
         Extract factual claims from an image containing text
 
         Args:
             image_path: Path to image file
+            on_text: Optional callback, called with visible_text as soon as
+                     that field is complete in the streamed response
 
         Returns:
             Dict with extracted claims structure
         """
-        prompt = """
-Analyze this image and extract any factual claims or text visible in it.
-Return as JSON with the following structure:
+        try:
+            # One read gives both the inline data for Qwen and the cache key
+            image_base64, image_sha256 = _load_image(image_path)
 
-{
-    "visible_text": "all text you can see in the image",
-    "main_claim": "primary claim being made",
-    "key_facts": [
-        {"claim": "specific fact 1", "checkable": true},
-        {"claim": "specific fact 2", "checkable": false}
-    ],
-    "entities": ["person1", "organization1", "location1"],
-    "dates_mentioned": ["date1", "date2"],
-    "image_description": "brief description of what the image shows"
-}
+            def analyze():
+                chunks = self.stream_image_with_base64(image_base64, CLAIMS_PROMPT, temperature=0.3)
+                return self._collect_claims(chunks, on_text)
 
-Important:
-- Extract ALL visible text accurately
-- Identify verifiable factual claims
-- Note any named entities (people, organizations, places)
-- Extract any dates or time references
-- Describe the image content briefly
-"""
+            return self._cached_claims(self._claims_cache_key(image_sha256), analyze, on_text)
+        except Exception as e:
+            raise Exception(f"Failed to extract claims from image: {str(e)}")
+
+    def extract_claims_from_bytes(
+        self,
+        image_bytes: bytes,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """
+        Extract factual claims from in-memory image data
 
+        Args:
+            image_bytes: Raw image file contents
+            on_text: Optional callback, called with visible_text as soon as
+                     that field is complete in the streamed response
+
+        Returns:
+            Dict with extracted claims structure
+        """
         try:
-            response_text = self.analyze_image_with_text(image_path, prompt, temperature=0.3)
-
-            # Try to parse JSON response
-            try:
-                # Remove markdown code blocks if present
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-
-                result = json.loads(response_text)
-
-                # Ensure required fields exist
-                if 'main_claim' not in result:
-                    result['main_claim'] = result.get('visible_text', '')[:200]
-                if 'key_facts' not in result:
-                    result['key_facts'] = []
-                if 'entities' not in result:
-                    result['entities'] = []
-                if 'dates_mentioned' not in result:
-                    result['dates_mentioned'] = []
-                if 'visible_text' not in result:
-                    result['visible_text'] = result.get('main_claim', '')
-
-                return result
-
-            except json.JSONDecodeError:
-                # Fallback: use response as visible text
-                return {
-                    "visible_text": response_text,
-                    "main_claim": response_text[:200],
-                    "key_facts": [{"claim": response_text[:200], "checkable": True}],
-                    "entities": [],
-                    "dates_mentioned": [],
-                    "image_description": "Could not parse structured response"
-                }
+            def analyze():
+                image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+                chunks = self.stream_image_with_base64(image_base64, CLAIMS_PROMPT, temperature=0.3)
+                return self._collect_claims(chunks, on_text)
 
+            image_sha256 = hashlib.sha256(image_bytes).hexdigest()
+            return self._cached_claims(self._claims_cache_key(image_sha256), analyze, on_text)
         except Exception as e:
             raise Exception(f"Failed to extract claims from image: {str(e)}")
 
+    def _claims_cache_key(self, image_sha256: str) -> str:
+        """Cache key for a claim extraction of the image with this digest"""
+        return VisionCache.make_key(image_sha256, self.model, CLAIMS_PROMPT_VERSION)
+
+    def _cached_claims(
+        self,
+        key: str,
+        analyze: Callable[[], Dict],
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """Serve a claim extraction from cache, or run analyze and store it"""
+        result = self.cache.get(key)
+        if result is not None:
+            if on_text is not None:
+                on_text(result.get('visible_text', ''))
+            return result
+
+        result = analyze()
+        # Unparseable responses are not cached so a retry can succeed
+        if result.get('image_description') != _UNPARSED_DESCRIPTION:
+            self.cache.set(key, result)
+        return result
+
+    def _collect_claims(
+        self,
+        chunks: Iterator[str],
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """
+        Accumulate streamed response text and parse the claims structure
+
+        visible_text is the first field in CLAIMS_PROMPT, so it usually
+        completes long before the rest of the response; on_text lets
+        callers start downstream work at that point.
+        """
+        scanner = _StringFieldScanner('visible_text') if on_text is not None else None
+        response_text = ""
+        for chunk in chunks:
+            response_text += chunk
+            if scanner is not None:
+                visible_text = scanner.feed(response_text)
+                if visible_text is not None:
+                    on_text(visible_text)
+                    scanner = None
+
+        return self._parse_claims_response(response_text)
+
+    def _parse_claims_response(self, response_text: str) -> Dict:
+        """Parse the JSON claims structure from a Qwen-VL response"""
+        # Try to parse JSON response
+        try:
+            # Take the JSON body out of a markdown code block if present
+            match = _FENCE_RE.search(response_text)
+            body = match.group(1) if match else response_text.strip()
+
+            result = orjson.loads(body)
+
+            # Ensure required fields exist
+            if 'main_claim' not in result:
+                result['main_claim'] = result.get('visible_text', '')[:200]
+            if 'key_facts' not in result:
+                result['key_facts'] = []
+            if 'entities' not in result:
+                result['entities'] = []
+            if 'dates_mentioned' not in result:
+                result['dates_mentioned'] = []
+            if 'visible_text' not in result:
+                result['visible_text'] = result.get('main_claim', '')
+
+            return result
+
+        except orjson.JSONDecodeError:
+            # Fallback: use response as visible text
+            return {
+                "visible_text": response_text,
+                "main_claim": response_text[:200],
+                "key_facts": [{"claim": response_text[:200], "checkable": True}],
+                "entities": [],
+                "dates_mentioned": [],
+                "image_description": _UNPARSED_DESCRIPTION
+            }
+
     def simple_image_query(self, image_path: str, question: str) -> str:
         """
         Ask a simple question about an image
@@ -234,3 +491,54 @@ Important:
             Answer text
         """
         return self.analyze_image_with_text(image_path, question)
+
+    def batch_analyze_image(
+        self,
+        image_path: str,
+        prompts: List[str],
+        temperature: float = 0.7
+    ) -> Dict[str, str]:
+        """
+        Ask several questions about one image in a single Qwen-VL request
+
+        The image is uploaded and encoded once. Any answer that cannot be
+        found in the combined response is fetched with its own request.
+
+        Args:
+            image_path: Path to image file
+            prompts: Questions to ask about the image
+            temperature: Sampling temperature (0-1)
+
+        Returns:
+            Dict mapping each prompt to its answer text
+        """
+        prompts = list(dict.fromkeys(prompts))
+        if len(prompts) <= 1:
+            return {prompt: self.analyze_image_with_text(image_path, prompt, temperature) for prompt in prompts}
+
+        combined_prompt = BATCH_PROMPT_HEADER.format(count=len(prompts)) + "\n".join(
+            f"{i}. {prompt}" for i, prompt in enumerate(prompts, 1)
+        )
+        response_text = self.analyze_image_with_text(image_path, combined_prompt, temperature)
+        answers = self._split_batch_answers(response_text, len(prompts))
+
+        results = {}
+        for i, prompt in enumerate(prompts, 1):
+            if i in answers:
+                results[prompt] = answers[i]
+            else:
+                results[prompt] = self.analyze_image_with_text(image_path, prompt, temperature)
+        return results
+
+    @staticmethod
+    def _split_batch_answers(response_text: str, count: int) -> Dict[int, str]:
+        """Split a combined response into {question number: answer}"""
+        markers = list(_BATCH_ANSWER_RE.finditer(response_text))
+        answers = {}
+        for marker, following in zip(markers, markers[1:] + [None]):
+            number = int(marker.group(1))
+            end = following.start() if following else len(response_text)
+            answer = response_text[marker.end():end].strip()
+            if 1 <= number <= count and answer and number not in answers:
+                answers[number] = answer
+        return answers
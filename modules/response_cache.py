@@ -0,0 +1,358 @@
+"""
+Response Cache Module
+Two-tier cache for Qwen responses: exact prompt match plus optional
+embedding-similarity match for near-duplicate prompts
+"""
+
+import os
+import json
+import asyncio
+import time
+import hashlib
+import threading
+import functools
+import orjson
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# numpy ships with sentence-transformers; only needed for the semantic tier
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Normalized embeddings lie in [-1, 1]; store them as int8 scaled by this
+_INT8_SCALE = 127.0
+
+# Query embeddings kept from semantic misses for the set() that usually follows
+_PENDING_EMBEDDINGS_MAX = 64
+
+
+class ResponseCache:
+    """Exact + semantic cache for LLM chat responses"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        use_semantic: bool = False,
+        similarity_threshold: float = 0.97,
+        embedding_model: str = "all-MiniLM-L6-v2"
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            max_entries: Maximum cached responses before LRU eviction
+            ttl_seconds: Seconds before a cached response expires
+            use_semantic: If True, also match near-duplicate prompts by
+                          embedding similarity (requires sentence-transformers)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedding_model: sentence-transformers model name
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+
+        self._entries = OrderedDict()  # key -> (timestamp, response)
+        self._semantic_index = {}      # scope -> list of (key, int8 embedding)
+        self._pending_embeddings = OrderedDict()  # key -> int8 embedding from a missed get()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        self._encoder = None
+        self.use_semantic = use_semantic
+        if self.use_semantic:
+            try:
+                if np is None:
+                    raise ImportError("numpy is required for the semantic cache")
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self.embedding_model)
+            except Exception as e:
+                print(f"Warning: Semantic cache disabled: {e}")
+                self.use_semantic = False
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Build a cache configured from QWEN_CACHE_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv("QWEN_CACHE_SIZE", 1024)),
+            ttl_seconds=float(os.getenv("QWEN_CACHE_TTL", 3600)),
+            use_semantic=os.getenv("QWEN_CACHE_SEMANTIC", "0") == "1",
+            similarity_threshold=float(os.getenv("QWEN_CACHE_SIMILARITY", 0.97))
+        )
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        """Hash model, messages, temperature and output mode into an exact-match key"""
+        request = {"model": model, "messages": messages, "temperature": temperature}
+        if response_format:
+            request["response_format"] = response_format
+        try:
+            payload = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    @staticmethod
+    def _split_messages(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ):
+        """
+        Split messages into a semantic scope and the text to embed
+
+        Only the final user message is compared by similarity; everything
+        else (model, temperature, output mode, system/earlier turns) must
+        match exactly.
+        """
+        scope = ResponseCache.make_key(model, messages[:-1], temperature, response_format)
+        text = str(messages[-1].get("content", "")) if messages else ""
+        return scope, text
+
+    def _embed(self, text: str):
+        return self._encoder.encode(text, normalize_embeddings=True)
+
+    @staticmethod
+    def _quantize(embedding):
+        """Quantize a normalized fp32 embedding to int8 (4x smaller)"""
+        return np.clip(np.rint(embedding * _INT8_SCALE), -127, 127).astype(np.int8)
+
+    def _get_fresh(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        timestamp, response = entry
+        if time.time() - timestamp > self.ttl_seconds:
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def _evict(self, key: str):
+        self._entries.pop(key, None)
+        for scope, items in list(self._semantic_index.items()):
+            remaining = [item for item in items if item[0] != key]
+            if remaining:
+                self._semantic_index[scope] = remaining
+            else:
+                del self._semantic_index[scope]
+
+    def get(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        key = self.make_key(model, messages, temperature, response_format)
+
+        with self._lock:
+            response = self._get_fresh(key)
+            if response is not None:
+                self.hits += 1
+                return response
+
+            if not self.use_semantic:
+                self.misses += 1
+                return None
+
+            scope, text = self._split_messages(model, messages, temperature, response_format)
+            candidates = list(self._semantic_index.get(scope, []))
+
+        # Embed outside the lock; encoding is the slow part
+        if candidates:
+            query = np.asarray(self._embed(text), dtype=np.float32)
+            matrix = np.stack([embedding for _, embedding in candidates]).astype(np.float32)
+            scores = (matrix @ query) / _INT8_SCALE
+            best = int(np.argmax(scores))
+            best_key, best_score = candidates[best][0], float(scores[best])
+
+            if best_score >= self.similarity_threshold:
+                with self._lock:
+                    response = self._get_fresh(best_key)
+                    if response is not None:
+                        self.semantic_hits += 1
+                        return response
+
+            # A miss is normally followed by set() for the same request;
+            # keep the embedding so it isn't computed twice
+            with self._lock:
+                self._pending_embeddings[key] = self._quantize(query)
+                while len(self._pending_embeddings) > _PENDING_EMBEDDINGS_MAX:
+                    self._pending_embeddings.popitem(last=False)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response: str,
+        response_format: Optional[Dict] = None
+    ):
+        """Store a response for the given request"""
+        key = self.make_key(model, messages, temperature, response_format)
+
+        embedding = None
+        if self.use_semantic:
+            scope, text = self._split_messages(model, messages, temperature, response_format)
+            with self._lock:
+                embedding = self._pending_embeddings.pop(key, None)
+            if embedding is None:
+                embedding = self._quantize(self._embed(text))
+
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (time.time(), response)
+            if embedding is not None:
+                self._semantic_index.setdefault(scope, []).append((key, embedding))
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._evict(oldest_key)
+
+    async def aget(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> Optional[str]:
+        """
+        Async variant of get
+
+        Exact hits are served inline; with the semantic tier on, a miss
+        falls back to get() in the default executor, since embedding and
+        the similarity search would otherwise block the event loop.
+        """
+        if not self.use_semantic:
+            return self.get(model, messages, temperature, response_format)
+
+        key = self.make_key(model, messages, temperature, response_format)
+        with self._lock:
+            response = self._get_fresh(key)
+            if response is not None:
+                self.hits += 1
+                return response
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get, model, messages, temperature, response_format)
+
+    async def aset(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response: str,
+        response_format: Optional[Dict] = None
+    ):
+        """Async variant of set; runs in the default executor when it may need to embed"""
+        if not self.use_semantic:
+            self.set(model, messages, temperature, response, response_format)
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self.set, model, messages, temperature, response, response_format)
+        )
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self._semantic_index.clear()
+            self._pending_embeddings.clear()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses
+            }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide ResponseCache, creating it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache.from_env()
+        return _shared_cache
+
+
+def cached_response(chat_method):
+    """
+    Decorator for QwenClient.chat / QwenClient.achat that serves repeated
+    requests from the client's ResponseCache
+    """
+    if asyncio.iscoroutinefunction(chat_method):
+        @functools.wraps(chat_method)
+        async def async_wrapper(
+            self,
+            messages: List[Dict[str, str]],
+            temperature: float = 0.7,
+            response_format: Optional[Dict] = None
+        ) -> str:
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return await chat_method(self, messages, temperature, response_format)
+
+            cached = await cache.aget(self.model, messages, temperature, response_format)
+            if cached is not None:
+                return cached
+
+            response = await chat_method(self, messages, temperature, response_format)
+            await cache.aset(self.model, messages, temperature, response, response_format)
+            return response
+
+        return async_wrapper
+
+    @functools.wraps(chat_method)
+    def wrapper(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        cache = getattr(self, "cache", None)
+        if cache is None:
+            return chat_method(self, messages, temperature, response_format)
+
+        cached = cache.get(self.model, messages, temperature, response_format)
+        if cached is not None:
+            return cached
+
+        response = chat_method(self, messages, temperature, response_format)
+        cache.set(self.model, messages, temperature, response, response_format)
+        return response
+
+    return wrapper
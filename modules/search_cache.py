@@ -0,0 +1,97 @@
+"""
+Search Cache Module
+Two-tier cache of DuckDuckGo / Google search results
+"""
+
+import os
+import asyncio
+import hashlib
+import threading
+import functools
+import inspect
+
+from modules.tiered_cache import TieredCache
+
+
+class SearchCache(TieredCache):
+    """Memory + disk cache of formatted search results"""
+
+    @classmethod
+    def from_env(cls) -> "SearchCache":
+        """Build a cache configured from SEARCH_CACHE_* environment variables"""
+        return cls(
+            directory=os.getenv("SEARCH_CACHE_DIR", ".cache/search"),
+            ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", 3600)),
+            memory_entries=int(os.getenv("SEARCH_CACHE_SIZE", 2048)),
+            enabled=os.getenv("SEARCH_CACHE_ENABLED", "1") == "1",
+            label="Search cache"
+        )
+
+    @staticmethod
+    def make_key(source: str, query: str, max_results: int) -> str:
+        """Hash the search source, query and result count"""
+        return hashlib.sha1(f"{source}|{query}|{max_results}".encode("utf-8")).hexdigest()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide SearchCache, creating it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache.from_env()
+        return _shared_cache
+
+
+def cached_search(source: str):
+    """
+    Decorator for MVPSearchEngine search methods (sync or async) that
+    serves repeated queries from the engine's SearchCache
+
+    Empty result lists are not cached; they usually mean a transient error.
+    """
+    def decorator(search_method):
+        # Keep each method's own default result count
+        default_max_results = inspect.signature(search_method).parameters['max_results'].default
+
+        if asyncio.iscoroutinefunction(search_method):
+            @functools.wraps(search_method)
+            async def async_wrapper(self, query: str, max_results: int = default_max_results):
+                cache = getattr(self, "cache", None)
+                if cache is None:
+                    return await search_method(self, query, max_results)
+
+                key = SearchCache.make_key(source, query, max_results)
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+
+                results = await search_method(self, query, max_results)
+                if results:
+                    cache.set(key, results)
+                return results
+
+            return async_wrapper
+
+        @functools.wraps(search_method)
+        def wrapper(self, query: str, max_results: int = default_max_results):
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return search_method(self, query, max_results)
+
+            key = SearchCache.make_key(source, query, max_results)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+            results = search_method(self, query, max_results)
+            if results:
+                cache.set(key, results)
+            return results
+
+        return wrapper
+
+    return decorator
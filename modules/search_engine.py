@@ -3,10 +3,66 @@ Search Engine Module
 Searches multiple sources for verification
 """
 
+import asyncio
+import httpx
 import requests
-from typing import Dict, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, TypedDict
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from duckduckgo_search import DDGS
 import os
+import threading
+
+from modules.search_cache import cached_search, get_search_cache
+
+
+class SearchResult(TypedDict, total=False):
+    """
+    A single search hit
+
+    Results stay plain dicts: they are cached, serialized to JSON and read
+    with .get() throughout the app, and there are only a handful per claim.
+    """
+    title: str
+    snippet: str
+    url: str
+    source: str
+    factcheck_site: bool
+    factcheck_source: str
+
+
+def make_result(title: str, snippet: str, url: str, source: str) -> SearchResult:
+    """Build a SearchResult with the standard keys"""
+    return {'title': title, 'snippet': snippet, 'url': url, 'source': source}
+
+
+GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+# Fact-check hits at which the context search may be skipped (see SEARCH_SKIP_CONTEXT_IF_FACTCHECKED)
+STRONG_FACTCHECK_COUNT = 2
+
+# Shared async HTTP client for Google Custom Search, created on first use
+_async_client = None
+_async_client_lock = threading.Lock()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the module-level httpx.AsyncClient"""
+    global _async_client
+    with _async_client_lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(http2=True, timeout=10)
+        return _async_client
+
+
+async def close_async_client():
+    """Close the shared httpx.AsyncClient"""
+    global _async_client
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
 
 
 class MVPSearchEngine:
@@ -25,6 +81,29 @@ class MVPSearchEngine:
             "apnews.com/ap-fact-check",
             "fullfact.org"
         ]
+
+        # One OR'd query covering every fact-check site (Google CSE path)
+        self._factcheck_sites_query = "(" + " OR ".join(f"site:{site}" for site in self.factcheck_sites) + ")"
+
+        # Keep-alive session for Google Custom Search requests
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+
+        # Shared memory + disk cache of search results (SEARCH_CACHE_ENABLED=0 to bypass)
+        self.cache = get_search_cache()
+
+        # Optionally drop the context search once fact-checks already cover the claim
+        self.skip_context_if_factchecked = os.getenv("SEARCH_SKIP_CONTEXT_IF_FACTCHECKED", "0") == "1"
+
+        # Key facts searched on their own, alongside context analysis (0 disables)
+        self.key_fact_fanout = int(os.getenv("SEARCH_KEY_FACT_FANOUT", 0))
+
+        # Cap concurrent DuckDuckGo requests to stay under its rate limits
+        self._ddg_semaphore = threading.BoundedSemaphore(int(os.getenv("DDG_MAX_CONCURRENCY", 3)))
     
     def search_and_verify(self, claims: Dict) -> Dict:
         """
@@ -37,17 +116,30 @@ class MVPSearchEngine:
             Dict with direct_evidence, context, and existing_factchecks
         """
         main_claim = claims.get('main_claim', '')
-        
-        # Search for main claim
-        direct_evidence = self.search_multiple_sources(main_claim)
-        
-        # Search for context
         context_query = f"{main_claim} full story context background"
-        context_results = self.search_multiple_sources(context_query)
-        
-        # Search for existing fact-checks
-        factcheck_query = f"{main_claim} fact check debunk verify"
-        factcheck_results = self.check_factcheck_sites(main_claim)
+
+        # The three searches are independent network calls; run them concurrently
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            # Search for main claim
+            direct_future = executor.submit(self.search_multiple_sources, main_claim)
+
+            # Search for context
+            context_future = executor.submit(self.search_multiple_sources, context_query)
+
+            # Search for existing fact-checks
+            factcheck_future = executor.submit(self.check_factcheck_sites, main_claim)
+
+            factcheck_results = factcheck_future.result()
+            if self._skip_context(factcheck_results):
+                context_future.cancel()
+                context_results = []
+            else:
+                context_results = context_future.result()
+            direct_evidence = direct_future.result()
+        finally:
+            # Don't block on a context search whose results were dropped
+            executor.shutdown(wait=False)
         
         return {
             'direct_evidence': direct_evidence[:5],
@@ -55,7 +147,134 @@ class MVPSearchEngine:
             'existing_factchecks': factcheck_results[:3]
         }
     
-    def search_multiple_sources(self, query: str, max_results: int = 5) -> List[Dict]:
+    def search_key_facts(self, claims: Dict, max_results: int = 3) -> List[SearchResult]:
+        """
+        Search the first SEARCH_KEY_FACT_FANOUT checkable key facts concurrently
+
+        Args:
+            claims: Extracted claims dict
+            max_results: Maximum results per key fact
+
+        Returns:
+            Results of all key-fact searches, in key-fact order
+        """
+        main_claim = claims.get('main_claim', '')
+        facts = [
+            fact.get('claim', '') for fact in claims.get('key_facts', ())
+            if fact.get('checkable', True) and fact.get('claim') and fact.get('claim') != main_claim
+        ][:self.key_fact_fanout]
+        if not facts:
+            return []
+
+        # Bounded pool; DuckDuckGo calls are further capped by DDG_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(len(facts), 8)) as executor:
+            futures = [executor.submit(self.search_multiple_sources, fact, max_results) for fact in facts]
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    async def asearch_and_verify(self, claims: Dict) -> Dict:
+        """
+        Async variant of search_and_verify
+
+        All queries are multiplexed on the event loop; DuckDuckGo's client
+        is synchronous, so its calls run in the default executor.
+
+        Args:
+            claims: Extracted claims dict
+
+        Returns:
+            Dict with direct_evidence, context, and existing_factchecks
+        """
+        main_claim = claims.get('main_claim', '')
+        context_query = f"{main_claim} full story context background"
+
+        direct_task = asyncio.ensure_future(self.asearch_multiple_sources(main_claim))
+        context_task = asyncio.ensure_future(self.asearch_multiple_sources(context_query))
+
+        try:
+            factcheck_results = await self.acheck_factcheck_sites(main_claim)
+        except BaseException:
+            direct_task.cancel()
+            context_task.cancel()
+            raise
+
+        if self._skip_context(factcheck_results):
+            context_task.cancel()
+            context_results = []
+        else:
+            context_results = await context_task
+        direct_evidence = await direct_task
+
+        return {
+            'direct_evidence': direct_evidence[:5],
+            'context': context_results[:5],
+            'existing_factchecks': factcheck_results[:3]
+        }
+
+    def _skip_context(self, factcheck_results: List[SearchResult]) -> bool:
+        """True if the context search can be dropped for these fact-check hits"""
+        return self.skip_context_if_factchecked and len(factcheck_results) >= STRONG_FACTCHECK_COUNT
+
+    async def asearch_multiple_sources(self, query: str, max_results: int = 5) -> List[SearchResult]:
+        """Async variant of search_multiple_sources; sources are queried concurrently"""
+        searches = [self.asearch_duckduckgo(query, max_results=max_results)]
+        if self.google_api_key and self.google_cse_id:
+            searches.append(self.asearch_google(query, max_results=3))
+
+        results = []
+        for source_results in await asyncio.gather(*searches):
+            results.extend(source_results)
+
+        return results[:max_results]
+
+    async def asearch_duckduckgo(self, query: str, max_results: int = 5) -> List[SearchResult]:
+        """Async wrapper around the synchronous DuckDuckGo client"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.search_duckduckgo, query, max_results)
+
+    @cached_search("google")
+    async def asearch_google(self, query: str, max_results: int = 3) -> List[SearchResult]:
+        """Async variant of search_google using the shared httpx client"""
+        try:
+            response = await _get_async_client().get(GOOGLE_SEARCH_URL, params=self._google_params(query, max_results))
+            response.raise_for_status()
+            return self._format_google_results(response.json())
+        except Exception as e:
+            print(f"Google search error: {e}")
+            return []
+
+    async def acheck_factcheck_sites(self, query: str) -> List[SearchResult]:
+        """Async variant of check_factcheck_sites"""
+        if self.google_api_key and self.google_cse_id:
+            results = self._tag_factcheck_results(
+                await self.asearch_google(f"{self._factcheck_sites_query} {query}", max_results=10)
+            )
+            if results:
+                return results
+
+        sites = self.factcheck_sites[:3]  # Limit to 3 sites for MVP
+
+        site_results = await asyncio.gather(
+            *(self.asearch_duckduckgo(f"site:{site} {query}", max_results=2) for site in sites),
+            return_exceptions=True
+        )
+
+        results = []
+        for site, found in zip(sites, site_results):
+            if isinstance(found, Exception):
+                print(f"Error searching {site}: {found}")
+                continue
+            for result in found:
+                result['factcheck_site'] = True
+                result['factcheck_source'] = site
+            results.extend(found)
+
+        return results
+    
+    def search_multiple_sources(self, query: str, max_results: int = 5) -> List[SearchResult]:
         """Search multiple sources"""
         results = []
         
@@ -70,71 +289,112 @@ class MVPSearchEngine:
         
         return results[:max_results]
     
-    def search_duckduckgo(self, query: str, max_results: int = 5) -> List[Dict]:
+    @cached_search("duckduckgo")
+    def search_duckduckgo(self, query: str, max_results: int = 5) -> List[SearchResult]:
         """Search using DuckDuckGo"""
         try:
-            with DDGS() as ddgs:
+            with self._ddg_semaphore, DDGS() as ddgs:
                 search_results = list(ddgs.text(query, max_results=max_results))
                 
-                formatted_results = []
-                for result in search_results:
-                    formatted_results.append({
-                        'title': result.get('title', ''),
-                        'snippet': result.get('body', ''),
-                        'url': result.get('href', ''),
-                        'source': 'duckduckgo'
-                    })
-                
-                return formatted_results
+                return [
+                    make_result(
+                        result.get('title', ''),
+                        result.get('body', ''),
+                        result.get('href', ''),
+                        'duckduckgo'
+                    )
+                    for result in search_results
+                ]
         except Exception as e:
             print(f"DuckDuckGo search error: {e}")
             return []
     
-    def search_google(self, query: str, max_results: int = 3) -> List[Dict]:
+    @cached_search("google")
+    def search_google(self, query: str, max_results: int = 3) -> List[SearchResult]:
         """Search using Google Custom Search API"""
         try:
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                'key': self.google_api_key,
-                'cx': self.google_cse_id,
-                'q': query,
-                'num': max_results
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            params = self._google_params(query, max_results)
+            response = self._session.get(GOOGLE_SEARCH_URL, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            formatted_results = []
-            
-            for item in data.get('items', []):
-                formatted_results.append({
-                    'title': item.get('title', ''),
-                    'snippet': item.get('snippet', ''),
-                    'url': item.get('link', ''),
-                    'source': 'google'
-                })
-            
-            return formatted_results
+            return self._format_google_results(response.json())
         except Exception as e:
             print(f"Google search error: {e}")
             return []
+
+    def _google_params(self, query: str, max_results: int) -> Dict:
+        """Query parameters for the Google Custom Search API"""
+        return {
+            'key': self.google_api_key,
+            'cx': self.google_cse_id,
+            'q': query,
+            'num': max_results
+        }
+
+    def _format_google_results(self, data: Dict) -> List[SearchResult]:
+        """Convert a Google Custom Search response to result dicts"""
+        return [
+            make_result(item.get('title', ''), item.get('snippet', ''), item.get('link', ''), 'google')
+            for item in data.get('items', [])
+        ]
     
-    def check_factcheck_sites(self, query: str) -> List[Dict]:
+    def check_factcheck_sites(self, query: str) -> List[SearchResult]:
         """Search specifically on fact-checking websites"""
+        # With Google CSE configured, all sites are covered by one request
+        if self.google_api_key and self.google_cse_id:
+            results = self._tag_factcheck_results(
+                self.search_google(f"{self._factcheck_sites_query} {query}", max_results=10)
+            )
+            if results:
+                return results
+
         results = []
+        sites = self.factcheck_sites[:3]  # Limit to 3 sites for MVP
         
-        # Search DuckDuckGo restricted to fact-check sites
-        for site in self.factcheck_sites[:3]:  # Limit to 3 sites for MVP
-            site_query = f"site:{site} {query}"
-            try:
-                site_results = self.search_duckduckgo(site_query, max_results=2)
-                for result in site_results:
-                    result['factcheck_site'] = True
-                    result['factcheck_source'] = site
-                results.extend(site_results)
-            except Exception as e:
-                print(f"Error searching {site}: {e}")
-                continue
+        # Search DuckDuckGo restricted to fact-check sites, one thread per site
+        with ThreadPoolExecutor(max_workers=len(sites)) as executor:
+            futures = [
+                (site, executor.submit(self.search_duckduckgo, f"site:{site} {query}", max_results=2))
+                for site in sites
+            ]
+
+            # Collect in site order so results stay deterministic
+            for site, future in futures:
+                try:
+                    site_results = future.result()
+                    for result in site_results:
+                        result['factcheck_site'] = True
+                        result['factcheck_source'] = site
+                    results.extend(site_results)
+                except Exception as e:
+                    print(f"Error searching {site}: {e}")
+                    continue
         
         return results
+
+    def _tag_factcheck_results(self, results: List[SearchResult]) -> List[SearchResult]:
+        """Keep results from known fact-check sites, tagged with their site"""
+        tagged = []
+        for result in results:
+            site = self._match_factcheck_site(result.get('url', ''))
+            if site:
+                result['factcheck_site'] = True
+                result['factcheck_source'] = site
+                tagged.append(result)
+        return tagged
+
+    def _match_factcheck_site(self, url: str) -> Optional[str]:
+        """Return the fact-check site (domain, optionally with path) a URL belongs to"""
+        try:
+            parsed = urlparse(url)
+        except ValueError:
+            return None
+        host = (parsed.hostname or '').lower()
+
+        for site in self.factcheck_sites:
+            domain, _, path = site.partition('/')
+            if host != domain and not host.endswith('.' + domain):
+                continue
+            if not path or parsed.path.lstrip('/').startswith(path):
+                return site
+        return None
@@ -0,0 +1,103 @@
+"""
+Tiered Cache Module
+In-memory LRU with TTL in front of an optional on-disk (diskcache) store
+"""
+
+import copy
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+class TieredCache:
+    """Memory + disk cache for JSON-like results"""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float = 3600,
+        memory_entries: int = 128,
+        enabled: bool = True,
+        label: str = "Cache"
+    ):
+        """
+        Initialize tiered cache
+
+        Args:
+            directory: Directory for the on-disk tier
+            ttl_seconds: Seconds before an entry expires (both tiers)
+            memory_entries: Size of the in-memory LRU tier
+            enabled: If False, every lookup misses and nothing is stored
+            label: Name used in warning messages
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.label = label
+
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+        self._disk = None
+        if enabled and diskcache is not None:
+            try:
+                self._disk = diskcache.Cache(directory)
+            except Exception as e:
+                print(f"Warning: {label} disk cache disabled: {e}")
+        elif enabled:
+            print(f"Warning: diskcache not installed, {label.lower()} is memory-only")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if time.time() < expires_at:
+                    self._memory.move_to_end(key)
+                    return copy.deepcopy(value)
+                del self._memory[key]
+
+        if self._disk is None:
+            return None
+        try:
+            value, expires_at = self._disk.get(key, expire_time=True)
+        except Exception:
+            return None
+        if value is not None:
+            # Promote with the disk entry's remaining lifetime, so repeated
+            # promotions can't keep an entry alive past its TTL
+            self._remember(key, value, expires_at)
+            return copy.deepcopy(value)
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers"""
+        if not self.enabled:
+            return
+
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+        if self._disk is not None:
+            try:
+                self._disk.set(key, value, expire=self.ttl_seconds)
+            except Exception as e:
+                print(f"{self.label} write error: {e}")
+
+    def _remember(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,107 @@
+"""
+URL Cache Module
+Persistent on-disk cache of processed URL results with HTTP
+ETag / Last-Modified revalidation
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+class UrlCache:
+    """Disk-backed cache of scraped articles keyed by URL"""
+
+    def __init__(
+        self,
+        directory: str = ".cache/urls",
+        max_age_seconds: float = 3600,
+        size_limit: int = 256 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        """
+        Initialize URL cache
+
+        Args:
+            directory: Directory for the SQLite-backed cache files
+            max_age_seconds: Seconds an entry is served without revalidation
+            size_limit: Maximum cache size on disk in bytes
+            enabled: If False, every lookup misses and nothing is stored
+        """
+        self.max_age_seconds = max_age_seconds
+
+        self._cache = None
+        if enabled and diskcache is not None:
+            try:
+                self._cache = diskcache.Cache(directory, size_limit=size_limit)
+            except Exception as e:
+                print(f"Warning: URL cache disabled: {e}")
+        elif enabled:
+            print("Warning: diskcache not installed, URL cache disabled")
+
+    @classmethod
+    def from_env(cls) -> "UrlCache":
+        """Build a cache configured from URL_CACHE_* environment variables"""
+        return cls(
+            directory=os.getenv("URL_CACHE_DIR", ".cache/urls"),
+            max_age_seconds=float(os.getenv("URL_CACHE_MAX_AGE", 3600)),
+            size_limit=int(os.getenv("URL_CACHE_SIZE_LIMIT", 256 * 1024 * 1024)),
+            enabled=os.getenv("URL_CACHE_ENABLED", "1") == "1"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache is not None
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for url, fresh or stale"""
+        if self._cache is None:
+            return None
+        try:
+            return self._cache.get(url)
+        except Exception:
+            return None
+
+    def is_fresh(self, entry: Optional[Dict]) -> bool:
+        """True if entry can be served without revalidation"""
+        return bool(entry) and time.time() - entry['fetched_at'] < self.max_age_seconds
+
+    def validators(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, result: Dict, response_headers) -> None:
+        """Cache a processed result along with the response validators"""
+        if self._cache is None:
+            return
+        entry = {
+            'result': result,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        }
+        try:
+            self._cache.set(url, entry)
+        except Exception as e:
+            print(f"URL cache write error: {e}")
+
+    def touch(self, url: str, entry: Dict) -> None:
+        """Mark a revalidated (304 Not Modified) entry as fresh again"""
+        if self._cache is None:
+            return
+        entry = dict(entry, fetched_at=time.time())
+        try:
+            self._cache.set(url, entry)
+        except Exception as e:
+            print(f"URL cache write error: {e}")
@@ -4,10 +4,27 @@ Calculates confidence scores and verdict
 """
 
 from typing import Dict, List
+from urllib.parse import urlsplit
+from itertools import chain
+import numpy as np
+
+
+# Marks the end of a complete domain in the reputable-domain trie
+_TRIE_END = ''
+
+
+def _normalize_url(url: str) -> str:
+    """Lowercase a URL and drop its query, fragment and trailing slash"""
+    parts = urlsplit(url.strip().lower())
+    return f"{parts.scheme}://{parts.netloc}{parts.path.rstrip('/')}"
 
 
 class SimpleVerifier:
     """Calculate verification verdict and confidence"""
+
+    # Score names and their weights in the confidence average (same order)
+    _SCORE_KEYS = ('source_agreement', 'reputable_sources', 'context_completeness', 'fact_check_exists')
+    _WEIGHTS = (0.35, 0.30, 0.20, 0.15)
     
     def __init__(self):
         self.reputable_domains = [
@@ -16,6 +33,7 @@ class SimpleVerifier:
             'factcheck.org', 'snopes.com', 'politifact.com',
             'fullfact.org', 'who.int', 'cdc.gov', 'gov.uk'
         ]
+        self._reputable_trie = self._build_domain_trie(self.reputable_domains)
     
     def calculate_verdict(self, claim: str, evidence: Dict, context: Dict) -> Dict:
         """
@@ -29,29 +47,20 @@ class SimpleVerifier:
         Returns:
             Dict with verdict, confidence, and detailed scores
         """
-        # Combine all evidence
-        all_evidence = []
-        all_evidence.extend(evidence.get('direct_evidence', []))
-        all_evidence.extend(evidence.get('context', []))
-        all_evidence.extend(evidence.get('existing_factchecks', []))
-        
-        # Calculate individual scores
-        scores = {
-            'source_agreement': self.check_agreement(all_evidence),
-            'reputable_sources': self.check_source_quality(all_evidence),
-            'context_completeness': self.score_context(context),
-            'fact_check_exists': self.check_factcheck_existence(evidence)
-        }
+        # Combine all evidence (each URL counted once)
+        all_evidence = self._combine_evidence(evidence)
         
-        # Weighted average
-        weights = {
-            'source_agreement': 0.35,
-            'reputable_sources': 0.30,
-            'context_completeness': 0.20,
-            'fact_check_exists': 0.15
-        }
+        # Calculate individual scores (in _SCORE_KEYS order)
+        scores = (
+            self.check_agreement(all_evidence),
+            self.check_source_quality(all_evidence),
+            self.score_context(context),
+            self.check_factcheck_existence(evidence)
+        )
         
-        confidence = sum(scores[k] * weights[k] for k in scores)
+        # Weighted average
+        w = self._WEIGHTS
+        confidence = scores[0] * w[0] + scores[1] * w[1] + scores[2] * w[2] + scores[3] * w[3]
         
         # Determine verdict
         verdict = self.determine_verdict(confidence, evidence)
@@ -59,10 +68,105 @@ class SimpleVerifier:
         return {
             'verdict': verdict,
             'confidence': round(confidence, 2),
-            'scores': {k: round(v, 2) for k, v in scores.items()},
+            'scores': dict(zip(self._SCORE_KEYS, (round(v, 2) for v in scores))),
             'evidence_count': len(all_evidence)
         }
     
+    def calculate_verdict_batch(
+        self,
+        claims: List[str],
+        evidences: List[Dict],
+        contexts: List[Dict]
+    ) -> List[Dict]:
+        """
+        Calculate verdicts for many claims at once
+
+        Per-claim scores are gathered into an (N, 4) array; confidence and
+        verdicts are then computed column-wise with NumPy. Results match
+        calculate_verdict for each claim.
+
+        Args:
+            claims: Main claims being verified
+            evidences: Search results, one per claim
+            contexts: Context analyses, one per claim
+
+        Returns:
+            List of dicts with verdict, confidence, and detailed scores
+        """
+        if not (len(claims) == len(evidences) == len(contexts)):
+            raise ValueError("claims, evidences and contexts must have the same length")
+        if not claims:
+            return []
+
+        evidence_counts = np.empty(len(claims), dtype=np.int64)
+        has_factchecks = np.empty(len(claims), dtype=bool)
+        scores = np.empty((len(claims), len(self._SCORE_KEYS)))
+
+        for i, (evidence, context) in enumerate(zip(evidences, contexts)):
+            all_evidence = self._combine_evidence(evidence)
+
+            evidence_counts[i] = len(all_evidence)
+            has_factchecks[i] = bool(evidence.get('existing_factchecks'))
+            scores[i] = (
+                self.check_agreement(all_evidence),
+                self.check_source_quality(all_evidence),
+                self.score_context(context),
+                self.check_factcheck_existence(evidence)
+            )
+
+        # Same summation order as calculate_verdict, so thresholds agree exactly
+        w = self._WEIGHTS
+        confidence = scores[:, 0] * w[0] + scores[:, 1] * w[1] + scores[:, 2] * w[2] + scores[:, 3] * w[3]
+
+        # Mirrors determine_verdict
+        verdicts = np.select(
+            [
+                has_factchecks & (confidence > 0.6),
+                has_factchecks,
+                confidence > 0.7,
+                confidence > 0.5,
+                confidence > 0.3
+            ],
+            [
+                "VERIFIED BY FACT-CHECKERS",
+                "FACT-CHECKED - NEEDS CONTEXT",
+                "LIKELY TRUE",
+                "NEEDS MORE CONTEXT",
+                "QUESTIONABLE"
+            ],
+            default="LIKELY FALSE OR MISLEADING"
+        )
+
+        return [
+            {
+                'verdict': str(verdicts[i]),
+                'confidence': round(float(confidence[i]), 2),
+                'scores': dict(zip(self._SCORE_KEYS, (round(float(v), 2) for v in scores[i]))),
+                'evidence_count': int(evidence_counts[i])
+            }
+            for i in range(len(claims))
+        ]
+    
+    def _combine_evidence(self, evidence: Dict) -> List[Dict]:
+        """
+        Merge the evidence lists, keeping the first item seen for each URL
+
+        The same page is often returned for both the claim and the context
+        query; counting it twice would inflate agreement and source quality.
+        Items without a URL are always kept.
+        """
+        seen = {}
+        for item in chain(
+            evidence.get('direct_evidence', ()),
+            evidence.get('context', ()),
+            evidence.get('existing_factchecks', ()),
+            evidence.get('key_fact_evidence', ())
+        ):
+            url = item.get('url', '')
+            key = _normalize_url(url) if url else id(item)
+            seen.setdefault(key, item)
+        return list(seen.values())
+
     def check_agreement(self, evidence: List[Dict]) -> float:
         """Check if sources agree (simplified for MVP)"""
         if not evidence:
@@ -82,22 +186,44 @@ class SimpleVerifier:
         if not evidence:
             return 0.0
         
-        reputable_count = 0
-        
-        for item in evidence:
-            url = item.get('url', '').lower()
-            for domain in self.reputable_domains:
-                if domain in url:
-                    reputable_count += 1
-                    break
+        reputable_count = sum(self.is_reputable(item.get('url', '')) for item in evidence)
         
         # Score based on percentage of reputable sources
-        if len(evidence) == 0:
-            return 0.0
-        
         score = reputable_count / len(evidence)
         return min(score * 1.2, 1.0)  # Boost score slightly
     
+    @staticmethod
+    def _build_domain_trie(domains: List[str]) -> Dict:
+        """Build a trie of reversed domain labels (bbc.com -> com -> bbc)"""
+        trie = {}
+        for domain in domains:
+            node = trie
+            for label in reversed(domain.lower().split('.')):
+                node = node.setdefault(label, {})
+            node[_TRIE_END] = True
+        return trie
+
+    def is_reputable(self, url: str) -> bool:
+        """
+        Check whether a URL's host is a reputable domain or a subdomain of one
+
+        The host's labels are walked right to left through a trie, so the
+        cost depends on the number of labels, not the number of domains.
+        """
+        try:
+            host = urlsplit(url).hostname or ''
+        except ValueError:
+            return False
+
+        node = self._reputable_trie
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _TRIE_END in node:
+                return True
+        return False
+
     def score_context(self, context: Dict) -> float:
         """Score context completeness"""
         score = 0.5  # Base score
@@ -0,0 +1,32 @@
+"""
+Vision Cache Module
+Content-addressed cache of Qwen-VL claim extractions
+"""
+
+import os
+import hashlib
+
+from modules.tiered_cache import TieredCache
+
+
+class VisionCache(TieredCache):
+    """Two-tier cache of image analysis results keyed by image content"""
+
+    @classmethod
+    def from_env(cls) -> "VisionCache":
+        """Build a cache configured from VISION_CACHE_* environment variables"""
+        return cls(
+            directory=os.getenv("VISION_CACHE_DIR", ".cache/qwen_vl"),
+            ttl_seconds=float(os.getenv("VISION_CACHE_EXPIRE", 30 * 86400)),
+            memory_entries=int(os.getenv("VISION_CACHE_MEMORY_SIZE", 128)),
+            enabled=os.getenv("VISION_CACHE_ENABLED", "1") == "1",
+            label="Vision cache"
+        )
+
+    @staticmethod
+    def make_key(image_sha256: str, *versions: str) -> str:
+        """Combine an image's SHA-256 digest with model/prompt versions"""
+        digest = hashlib.sha256(image_sha256.encode("ascii"))
+        for version in versions:
+            digest.update(b"\0" + version.encode("utf-8"))
+        return digest.hexdigest()
@@ -6,8 +6,11 @@ Runs all tests and creates a comprehensive HTML report
 import unittest
 import sys
 import os
+import html
+import time
 from datetime import datetime
 from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
 import json
 
 # Add modules to path
@@ -19,73 +22,46 @@ class HTMLTestResult(unittest.TextTestResult):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.test_results = []
-        self.start_time = None
-        self.end_time = None
+        self.report_items = []  # rendered HTML blocks, one per test
+        self._start_ns = None
+        self._status_by_id = {}
+    
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._status_by_id[id(test)] = ("FAIL", self.failures[-1][1], "Assertion Error")
+    
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._status_by_id[id(test)] = ("ERROR", self.errors[-1][1], "Exception")
+    
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._status_by_id[id(test)] = ("SKIP", self.skipped[-1][1], "Skipped")
     
     def startTest(self, test):
         super().startTest(test)
-        self.start_time = datetime.now()
+        self._start_ns = time.perf_counter_ns()
     
     def stopTest(self, test):
         super().stopTest(test)
-        self.end_time = datetime.now()
-        duration = (self.end_time - self.start_time).total_seconds() if self.start_time else 0.0
-        
-        # Determine status
-        status = "PASS"
-        message = ""
-        error_type = ""
-        
-        # Check if test failed
-        for failure in self.failures:
-            if failure[0] == test:
-                status = "FAIL"
-                message = failure[1]
-                error_type = "Assertion Error"
-                break
-        
-        # Check if test had error
-        for error in self.errors:
-            if error[0] == test:
-                status = "ERROR"
-                message = error[1]
-                error_type = "Exception"
-                break
-        
-        # Check if test was skipped
-        for skipped in self.skipped:
-            if skipped[0] == test:
-                status = "SKIP"
-                message = skipped[1]
-                error_type = "Skipped"
-                break
-        
-        self.test_results.append({
+        duration = (time.perf_counter_ns() - self._start_ns) / 1e9 if self._start_ns is not None else 0.0
+        
+        # Status recorded by addFailure/addError/addSkip, if any
+        status, message, error_type = self._status_by_id.pop(id(test), ("PASS", "", ""))
+        
+        # Render the report block now so the report step only concatenates
+        self.report_items.append(render_test_item({
             'name': str(test),
             'doc': test.shortDescription() or str(test),
             'status': status,
             'duration': duration,
             'message': message,
             'error_type': error_type
-        })
+        }))
 
 
-def generate_html_report(result, output_file='test_report.html'):
-    """Generate comprehensive HTML report"""
-    
-    # Calculate statistics
-    total_tests = result.testsRun
-    passed = total_tests - len(result.failures) - len(result.errors) - len(result.skipped)
-    failed = len(result.failures)
-    errors = len(result.errors)
-    skipped = len(result.skipped)
-    success_rate = (passed / total_tests * 100) if total_tests > 0 else 0
-    
-    # Get test results
-    test_results = result.test_results if hasattr(result, 'test_results') else []
-    
-    html_content = f"""<!DOCTYPE html>
+# Report templates (str.format); hoisted so they are built once
+REPORT_HEADER_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -395,7 +371,7 @@ def generate_html_report(result, output_file='test_report.html'):
         <div class="header">
             <h1>🔍 Fact-Checker MVP Test Report</h1>
             <p>Comprehensive Test Suite Results</p>
-            <div class="timestamp">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</div>
+            <div class="timestamp">Generated on {generated_at}</div>
         </div>
         
         <div class="summary">
@@ -448,31 +424,20 @@ def generate_html_report(result, output_file='test_report.html'):
             
             <div class="test-list" id="testList">
 """
-    
-    # Add test items
-    for i, test in enumerate(test_results, 1):
-        status_class = test['status'].lower()
-        message_html = ""
-        
-        if test['message']:
-            message_class = 'error' if test['status'] == 'ERROR' else ''
-            # Escape and limit message length
-            safe_message = str(test['message'])[:1000]
-            message_html = f'<div class="test-message {message_class}">{safe_message}</div>'
-        
-        html_content += f"""
+
+TEST_ITEM_TEMPLATE = """
                 <div class="test-item {status_class}" data-status="{status_class}">
                     <div class="test-header">
-                        <div class="test-name">{test['doc']}</div>
-                        <div class="test-status {status_class}">{test['status']}</div>
+                        <div class="test-name">{doc}</div>
+                        <div class="test-status {status_class}">{status}</div>
                     </div>
-                    <div class="test-description">{test['name']}</div>
-                    <div class="test-duration">⏱️ Duration: {test['duration']:.3f}s</div>
+                    <div class="test-description">{name}</div>
+                    <div class="test-duration">⏱️ Duration: {duration:.3f}s</div>
                     {message_html}
                 </div>
 """
-    
-    html_content += """
+
+REPORT_FOOTER = """
             </div>
         </div>
         
@@ -504,15 +469,115 @@ def generate_html_report(result, output_file='test_report.html'):
 </body>
 </html>
 """
+
+
+def render_test_item(test):
+    """Render one test result block of the HTML report"""
+    message_html = ""
+    
+    if test['message']:
+        message_class = 'error' if test['status'] == 'ERROR' else ''
+        # Escape and limit message length
+        safe_message = html.escape(str(test['message'])[:1000])
+        message_html = f'<div class="test-message {message_class}">{safe_message}</div>'
+    
+    return TEST_ITEM_TEMPLATE.format_map(dict(
+        test,
+        status_class=test['status'].lower(),
+        doc=html.escape(test['doc']),
+        name=html.escape(test['name']),
+        message_html=message_html
+    ))
+
+
+def generate_html_report(result, output_file='test_report.html'):
+    """Generate comprehensive HTML report"""
     
-    # Write to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Calculate statistics
+    total_tests = result.testsRun
+    passed = total_tests - len(result.failures) - len(result.errors) - len(result.skipped)
+    failed = len(result.failures)
+    errors = len(result.errors)
+    skipped = len(result.skipped)
+    success_rate = (passed / total_tests * 100) if total_tests > 0 else 0
+    
+    # Test blocks rendered by HTMLTestResult as the tests ran
+    report_items = getattr(result, 'report_items', [])
+    
+    # Stream the report straight into the file; no full-report string is built
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(REPORT_HEADER_TEMPLATE.format(
+            generated_at=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+            total_tests=total_tests,
+            passed=passed,
+            failed=failed,
+            errors=errors,
+            skipped=skipped,
+            success_rate=success_rate
+        ))
+        
+        # Add test items
+        f.writelines(report_items)
+        
+        f.write(REPORT_FOOTER)
     
     print(f"\n✅ HTML Report generated: {output_file}")
     return output_file
 
 
+# Test classes from test_suite.py; each is independent and can run in its own process
+TEST_CLASS_NAMES = [
+    'TestQwenClient', 'TestQwenClientOffline', 'TestResponseCache', 'TestInputProcessor',
+    'TestQwenVisionClient', 'TestClaimExtractor', 'TestClaimExtractorOffline', 'TestSearchEngine',
+    'TestSearchCache', 'TestContextAnalyzer', 'TestVerifier', 'TestIntegration', 'TestVisionProbe'
+]
+
+
+class MergedTestResult:
+    """Aggregate of per-class results, shaped like the TestResult fields the report reads"""
+    
+    def __init__(self):
+        self.testsRun = 0
+        self.failures = []
+        self.errors = []
+        self.skipped = []
+        self.report_items = []
+    
+    def merge(self, class_result: dict):
+        self.testsRun += class_result['tests_run']
+        self.failures.extend(class_result['failures'])
+        self.errors.extend(class_result['errors'])
+        self.skipped.extend(class_result['skipped'])
+        self.report_items.extend(class_result['report_items'])
+
+
+def _run_test_class(class_name):
+    """
+    Run one TestCase class from test_suite.py
+    
+    Args:
+        class_name: Name of the TestCase class
+        
+    Returns:
+        Dict of picklable results (test objects are replaced by their names)
+    """
+    import test_suite
+    
+    suite = unittest.TestLoader().loadTestsFromTestCase(getattr(test_suite, class_name))
+    stream = StringIO()
+    runner = unittest.TextTestRunner(stream=stream, verbosity=2, resultclass=HTMLTestResult)
+    result = runner.run(suite)
+    
+    return {
+        'output': stream.getvalue(),
+        'tests_run': result.testsRun,
+        'failures': [(str(test), message) for test, message in result.failures],
+        'errors': [(str(test), message) for test, message in result.errors],
+        'skipped': [(str(test), reason) for test, reason in result.skipped],
+        'report_items': result.report_items
+    }
+
+
 def run_all_tests():
     """Run all tests and generate HTML report"""
     
@@ -521,32 +586,22 @@ def run_all_tests():
     print("=" * 80)
     print()
     
-    # Import test suite
-    from test_suite import (
-        TestQwenClient, TestInputProcessor, TestClaimExtractor,
-        TestSearchEngine, TestContextAnalyzer, TestVerifier, TestIntegration
-    )
-    
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestQwenClient))
-    suite.addTests(loader.loadTestsFromTestCase(TestInputProcessor))
-    suite.addTests(loader.loadTestsFromTestCase(TestClaimExtractor))
-    suite.addTests(loader.loadTestsFromTestCase(TestSearchEngine))
-    suite.addTests(loader.loadTestsFromTestCase(TestContextAnalyzer))
-    suite.addTests(loader.loadTestsFromTestCase(TestVerifier))
-    suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
+    # One worker process per test class (TEST_WORKERS=1 runs them in-process, serially)
+    workers = int(os.getenv("TEST_WORKERS", min(len(TEST_CLASS_NAMES), os.cpu_count() or 1)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            class_results = list(executor.map(_run_test_class, TEST_CLASS_NAMES))
+    else:
+        class_results = [_run_test_class(name) for name in TEST_CLASS_NAMES]
     
-    # Run tests with custom result collector
-    stream = StringIO()
-    runner = unittest.TextTestRunner(stream=stream, verbosity=2, resultclass=HTMLTestResult)
-    result = runner.run(suite)
+    # Merge in class order so output and report match a serial run
+    result = MergedTestResult()
+    for class_result in class_results:
+        result.merge(class_result)
     
     # Print test output
-    print(stream.getvalue())
+    for class_result in class_results:
+        print(class_result['output'])
     
     # Print summary
     print()
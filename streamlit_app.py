@@ -4,33 +4,34 @@ Powered by Alibaba Qwen 3 LLM
 """
 
 import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 import streamlit as st
 from dotenv import load_dotenv
 
-from modules.input_processor import SimpleInputProcessor
-from modules.claim_extractor import ClaimExtractor
-from modules.search_engine import MVPSearchEngine
-from modules.context_analyzer import ContextAnalyzer
-from modules.verifier import SimpleVerifier
+# Load environment once per process; Streamlit reruns this script on every interaction.
+# No spinner: it would be the page's first element, ahead of set_page_config()
+@st.cache_resource(show_spinner=False)
+def _bootstrap_env():
+    """Load .env and propagate Streamlit secrets into os.environ"""
+    # Load local .env for development; on Streamlit Cloud, use app secrets
+    load_dotenv()
 
-# Load local .env for development; on Streamlit Cloud, use app secrets
-load_dotenv()
-
-# Load secrets from Streamlit Cloud if available
-try:
-    if hasattr(st, 'secrets'):
-        if "DASHSCOPE_API_KEY" in st.secrets:
-            os.environ["DASHSCOPE_API_KEY"] = st.secrets["DASHSCOPE_API_KEY"]
-        if "GOOGLE_API_KEY" in st.secrets:
-            os.environ["GOOGLE_API_KEY"] = st.secrets["GOOGLE_API_KEY"]
-        if "GOOGLE_CSE_ID" in st.secrets:
-            os.environ["GOOGLE_CSE_ID"] = st.secrets["GOOGLE_CSE_ID"]
-except Exception:
-    # Secrets not available, will use environment variables
-    pass
+    # Load secrets from Streamlit Cloud if available
+    try:
+        if hasattr(st, 'secrets'):
+            if "DASHSCOPE_API_KEY" in st.secrets:
+                os.environ["DASHSCOPE_API_KEY"] = st.secrets["DASHSCOPE_API_KEY"]
+            if "GOOGLE_API_KEY" in st.secrets:
+                os.environ["GOOGLE_API_KEY"] = st.secrets["GOOGLE_API_KEY"]
+            if "GOOGLE_CSE_ID" in st.secrets:
+                os.environ["GOOGLE_CSE_ID"] = st.secrets["GOOGLE_CSE_ID"]
+    except Exception:
+        # Secrets not available, will use environment variables
+        pass
+
+_bootstrap_env()
 
 # Configure page
 st.set_page_config(
@@ -95,6 +96,13 @@ st.markdown("""
 def get_modules():
     """Initialize and cache all processing modules"""
     try:
+        # Imported here so reruns don't pay for the heavy module imports
+        from modules.input_processor import SimpleInputProcessor
+        from modules.claim_extractor import ClaimExtractor
+        from modules.search_engine import MVPSearchEngine
+        from modules.context_analyzer import ContextAnalyzer
+        from modules.verifier import SimpleVerifier
+
         return (
             SimpleInputProcessor(),
             ClaimExtractor(),
@@ -154,8 +162,23 @@ elif input_type == "Image":
 
 run_btn = st.button("🔍 Check Facts", type="primary", use_container_width=True)
 
+# CSS class for each verdict SimpleVerifier.determine_verdict can return
+_VERDICT_CLASSES = {
+    "VERIFIED BY FACT-CHECKERS": "verdict-true",
+    "FACT-CHECKED - NEEDS CONTEXT": "verdict-neutral",
+    "LIKELY TRUE": "verdict-true",
+    "NEEDS MORE CONTEXT": "verdict-neutral",
+    "QUESTIONABLE": "verdict-neutral",
+    "LIKELY FALSE OR MISLEADING": "verdict-false",
+}
+
 def get_verdict_class(verdict: str) -> str:
     """Get CSS class based on verdict"""
+    verdict_class = _VERDICT_CLASSES.get(verdict)
+    if verdict_class:
+        return verdict_class
+    
+    # Unknown verdict text: fall back to keyword matching
     v = verdict.upper()
     if "VERIFIED" in v or "TRUE" in v:
         return "verdict-true"
@@ -178,12 +201,14 @@ def render_sources(evidence: Dict):
             col1, col2 = st.columns([4, 1])
             with col1:
                 st.markdown(f"**{idx}. {src.get('title', 'Untitled')}**")
-                st.caption(src.get('snippet', '')[:200] + '...' if len(src.get('snippet', '')) > 200 else src.get('snippet', ''))
+                snippet = src.get('snippet') or ''
+                st.caption(snippet[:200] + '...' if len(snippet) > 200 else snippet)
                 if src.get('factcheck_site'):
                     st.success("✓ Fact-Check Site", icon="✅")
             with col2:
-                if src.get('url'):
-                    st.link_button("View", src['url'], use_container_width=True)
+                url = src.get('url')
+                if url:
+                    st.link_button("View", url, use_container_width=True)
         st.divider()
 
 def render_timeline(timeline: List[Dict]):
@@ -220,18 +245,8 @@ if run_btn:
                     st.error("Please upload an image.")
                     st.stop()
                 
-                # Save temp file for OCR
-                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(image_file.name)[1]) as tmp:
-                    tmp.write(image_file.read())
-                    tmp_path = tmp.name
-                
-                processed = input_processor.process(tmp_path, "image")
-                
-                # Clean up temp file
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
+                # The processor takes image bytes directly; no temp file needed
+                processed = input_processor.process(image_file.getvalue(), "image")
 
                 if processed.get("error"):
                     st.warning("⚠️ OCR may be unavailable in this environment. Proceeding with limited analysis.")
@@ -244,9 +259,15 @@ if run_btn:
         with st.spinner("Searching and verifying across multiple sources..."):
             evidence = search_engine.search_and_verify(claims)
 
-        # Analyze context
+        # Analyze context; key-fact searches (SEARCH_KEY_FACT_FANOUT) run alongside it
         with st.spinner("Analyzing context and identifying missing information..."):
-            context = context_analyzer.analyze_context(claims["main_claim"], evidence)
+            if search_engine.key_fact_fanout:
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    key_fact_future = executor.submit(search_engine.search_key_facts, claims)
+                    context = context_analyzer.analyze_context(claims["main_claim"], evidence)
+                    evidence["key_fact_evidence"] = key_fact_future.result()
+            else:
+                context = context_analyzer.analyze_context(claims["main_claim"], evidence)
 
         # Calculate verdict
         verdict_data = verifier.calculate_verdict(claims["main_claim"], evidence, context)
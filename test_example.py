@@ -3,15 +3,27 @@ Test script to verify the fact-checker setup
 Run this after setting up to test the system
 """
 
+import atexit
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+
+# One keep-alive session for every request to the backend
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+atexit.register(SESSION.close)
 
 # Test the backend is running
 def test_health():
     try:
-        response = requests.get("http://localhost:8000/")
+        response = SESSION.get("http://localhost:8000/")
         print("✓ Backend is running!")
-        print(f"  Response: {response.json()}")
+        print(f"  Response: {orjson.loads(response.content)}")
         return True
     except Exception as e:
         print(f"✗ Backend not running: {e}")
@@ -22,14 +34,14 @@ def test_factcheck():
     try:
         sample_text = "Water boils at 100 degrees Celsius at sea level."
         
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:8000/api/factcheck/text",
             json={"text": sample_text},
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print("\n✓ Fact-check test successful!")
             print(f"  Main Claim: {result['main_claim']}")
             print(f"  Verdict: {result['verdict']}")
@@ -1,14 +1,30 @@
 """
 Comprehensive Test Suite for Fact-Checker MVP
 Tests all major components and functionality
+
+Tests that call the live Qwen API are skipped by default; run with
+--network (or FACTCHECK_NETWORK_TESTS=1) to include them.
 """
 
 import unittest
 import sys
 import os
+import io
 import json
+import asyncio
+import hashlib
+import functools
+from types import MappingProxyType, SimpleNamespace
+from unittest import mock
 from datetime import datetime
 import time
+import csv
+import threading
+import faulthandler
+import importlib.util
+import py_compile
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -23,19 +39,192 @@ from modules.claim_extractor import ClaimExtractor
 from modules.search_engine import MVPSearchEngine
 from modules.context_analyzer import ContextAnalyzer
 from modules.verifier import SimpleVerifier
+from modules.tiered_cache import TieredCache
+from modules.url_cache import UrlCache
+
+
+# Live API tests are opt-in so the default run is fast and offline
+RUN_NETWORK_TESTS = '--network' in sys.argv or os.getenv("FACTCHECK_NETWORK_TESTS", "0") == "1"
+if '--network' in sys.argv:
+    sys.argv.remove('--network')
+
+
+# Time limit for each network test. Failures are not retried: the Qwen tests
+# read results prefetched in setUpClass, so a rerun would not issue a new call
+NETWORK_TEST_TIMEOUT = float(os.getenv("FACTCHECK_TEST_TIMEOUT", 30))
+
+
+def _call_with_timeout(func, timeout):
+    """
+    Run func in a daemon thread and return its result
+    
+    Raises:
+        TimeoutError: If func has not finished after timeout seconds (the
+                      thread is abandoned; being a daemon it won't block exit)
+    """
+    outcome = {}
+    
+    def target():
+        try:
+            outcome['value'] = func()
+        except BaseException as e:
+            outcome['error'] = e
+    
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"Test timed out after {timeout:.0f}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
+
+
+def _with_timeout(test_method):
+    """Fail a test method that runs longer than NETWORK_TEST_TIMEOUT"""
+    @functools.wraps(test_method)
+    def wrapper(self):
+        return _call_with_timeout(lambda: test_method(self), NETWORK_TEST_TIMEOUT)
+    
+    return wrapper
+
+
+def network_test(test_item):
+    """
+    Mark a test method or TestCase class as needing live network/API access
+
+    Marked tests are skipped unless network tests are enabled, and each of
+    their test methods gets a time limit.
+    """
+    if isinstance(test_item, type):
+        for name in unittest.TestLoader().getTestCaseNames(test_item):
+            setattr(test_item, name, _with_timeout(getattr(test_item, name)))
+    else:
+        test_item = _with_timeout(test_item)
+    return unittest.skipUnless(
+        RUN_NETWORK_TESTS,
+        "network test (pass --network or set FACTCHECK_NETWORK_TESTS=1)"
+    )(test_item)
+
+
+# Canned network payloads so search / URL tests don't depend on live HTTP
+DDG_SAMPLE_RESULTS = [
+    {
+        'title': 'Boiling point of water - Wikipedia',
+        'body': 'At sea level, water boils at 100 degrees Celsius (212 degrees Fahrenheit).',
+        'href': 'https://en.wikipedia.org/wiki/Boiling_point'
+    },
+    {
+        'title': 'Why does water boil at 100 degrees Celsius?',
+        'body': 'The boiling point of water depends on atmospheric pressure.',
+        'href': 'https://www.scientificamerican.com/article/boiling-point/'
+    },
+    {
+        'title': 'Fact check: water boiling temperature',
+        'body': 'Claims about the boiling point of water at altitude, explained.',
+        'href': 'https://www.snopes.com/fact-check/water-boiling/'
+    }
+]
+
+LONG_TEXT = "Test " * 1000
+
+# Read-only fixtures shared by tests that never mutate their inputs
+TEST_CLAIMS = MappingProxyType({
+    'main_claim': 'Test claim',
+    'key_facts': (),
+    'entities': (),
+    'dates_mentioned': ()
+})
+EMPTY_EVIDENCE = MappingProxyType({'direct_evidence': (), 'context': (), 'existing_factchecks': ()})
+EMPTY_CONTEXT = MappingProxyType({'missing_context': (), 'full_picture': '', 'timeline': ()})
+
+EXAMPLE_HTML = (
+    "<html><head><title>Example Domain</title><style>p {color: red}</style></head>"
+    "<body><h1>Example Domain</h1><p>This domain is for use in illustrative examples "
+    "in documents.</p><script>var x = 1;</script></body></html>"
+)
+
+
+class FakeDDGS:
+    """Stand-in for duckduckgo_search.DDGS returning DDG_SAMPLE_RESULTS"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def text(self, query, max_results=None):
+        return [dict(result) for result in DDG_SAMPLE_RESULTS[:max_results]]
+
+
+# Replays LLM-backed results across runs (FACTCHECK_TEST_CACHE=0 forces live calls)
+TEST_CACHE = TieredCache(
+    directory=os.getenv("FACTCHECK_TEST_CACHE_DIR", ".cache/test_llm"),
+    ttl_seconds=float(os.getenv("FACTCHECK_TEST_CACHE_TTL", 7 * 86400)),
+    enabled=os.getenv("FACTCHECK_TEST_CACHE", "1") == "1",
+    label="Test cache"
+)
+
+
+def cached_llm(method):
+    """
+    Wrap a bound single-text LLM method so results are served from TEST_CACHE
+
+    Keyed on the Qwen model, the method name and the SHA-256 of the input;
+    results carrying an 'error' (API fallbacks) are never stored.
+    """
+    owner = method.__self__
+    
+    @functools.wraps(method)
+    def wrapper(text):
+        key = hashlib.sha256(
+            f"{owner.qwen.model}\0{method.__qualname__}\0{text}".encode("utf-8")
+        ).hexdigest()
+        result = TEST_CACHE.get(key)
+        if result is None:
+            result = method(text)
+            if not result.get('error'):
+                TEST_CACHE.set(key, result)
+        return result
+    
+    return wrapper
 
 
 class TestQwenClient(unittest.TestCase):
     """Test Qwen 3 LLM Client"""
     
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for the class"""
         try:
-            self.client = QwenClient()
-            self.qwen_available = True
+            cls.client = QwenClient()
+            cls.qwen_available = True
         except Exception as e:
-            self.qwen_available = False
-            self.skipTest(f"Qwen client not available: {e}")
+            cls.qwen_available = False
+            cls.init_error = e
+            return
+        
+        if not RUN_NETWORK_TESTS:
+            return
+        
+        # The API tests are independent round trips; issue them together up
+        # front (through the sync client path) and let each test check its future
+        # (not waited on here, so a hung call is bounded by the tests' time limit)
+        executor = ThreadPoolExecutor(max_workers=2)
+        cls.responses = {
+            'simple': executor.submit(cls.client.simple_prompt, "Say 'test' if you can hear me"),
+            'json': executor.submit(
+                cls.client.extract_json_response,
+                'Return this JSON: {"status": "ok", "value": 42}'
+            )
+        }
+        executor.shutdown(wait=False)
+    
+    def setUp(self):
+        """Skip every test if the client could not be created"""
+        if not self.qwen_available:
+            self.skipTest(f"Qwen client not available: {self.init_error}")
     
     def test_01_client_initialization(self):
         """Test 1: Qwen client initializes correctly"""
@@ -43,12 +232,13 @@ class TestQwenClient(unittest.TestCase):
         self.assertIsNotNone(self.client.api_key)
         self.assertEqual(self.client.model, "qwen-plus")
     
+    @network_test
     def test_02_simple_prompt(self):
         """Test 2: Simple prompt returns response"""
         if not self.qwen_available:
             self.skipTest("Qwen not available")
         try:
-            response = self.client.simple_prompt("Say 'test' if you can hear me")
+            response = self.responses['simple'].result()
             self.assertIsInstance(response, str)
             self.assertGreater(len(response), 0)
         except Exception as e:
@@ -56,26 +246,272 @@ class TestQwenClient(unittest.TestCase):
                 self.skipTest(f"SSL Certificate issue - {str(e)[:100]}")
             raise
     
+    @network_test
     def test_03_json_extraction(self):
         """Test 3: JSON extraction works correctly"""
         if not self.qwen_available:
             self.skipTest("Qwen not available")
         try:
-            prompt = 'Return this JSON: {"status": "ok", "value": 42}'
-            result = self.client.extract_json_response(prompt)
+            result = self.responses['json'].result()
             self.assertIsInstance(result, dict)
         except Exception as e:
             if 'SSL' in str(e) or 'CERTIFICATE' in str(e):
                 self.skipTest(f"SSL Certificate issue - {str(e)[:100]}")
             raise
 
+class TestQwenClientOffline(unittest.TestCase):
+    """Test Qwen client response handling with the API mocked out"""
+    
+    def setUp(self):
+        env = {"DASHSCOPE_API_KEY": "sk-test", "QWEN_CACHE_ENABLED": "0"}
+        with mock.patch.dict(os.environ, env):
+            self.client = QwenClient()
+    
+    def test_48_parse_json_response(self):
+        """Test 48: JSON responses parse to dicts; anything else raises ValueError"""
+        self.assertEqual(QwenClient.parse_json_response('{"status": "ok", "value": 42}'), {"status": "ok", "value": 42})
+        for bad in (None, "", "not json", "[1, 2]"):
+            with self.subTest(response_text=bad), self.assertRaises(ValueError):
+                QwenClient.parse_json_response(bad)
+    
+    @staticmethod
+    def _fake_session(outcomes):
+        """aiohttp session stand-in whose post() plays outcomes: an exception or (status, body)"""
+        session = mock.Mock()
+        outcomes = iter(outcomes)
+        
+        @asynccontextmanager
+        async def post(url, json=None):
+            outcome = next(outcomes)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            status, body = outcome
+            response = mock.Mock(status=status)
+            response.json = mock.AsyncMock(return_value=body)
+            response.text = mock.AsyncMock(return_value=str(body))
+            yield response
+        
+        session.post = mock.Mock(side_effect=post)
+        return session
+    
+    def _run_achat(self, outcomes):
+        """
+        Run achat against a fake session
+        
+        Returns:
+            Tuple of (reply or raised exception, post mock, [(delay, semaphore held) per backoff sleep])
+        """
+        session = self._fake_session(outcomes)
+        sleeps = []
+        
+        async def run():
+            semaphore = asyncio.Semaphore(1)
+            
+            async def sleep(delay):
+                sleeps.append((delay, semaphore.locked()))
+            
+            with mock.patch.object(self.client, '_get_async_resources',
+                                   mock.AsyncMock(return_value=(session, semaphore))), \
+                    mock.patch('modules.qwen_client.asyncio.sleep', sleep):
+                try:
+                    return await self.client.achat([{"role": "user", "content": "hi"}])
+                except Exception as e:
+                    return e
+        
+        return asyncio.run(run()), session.post, sleeps
+    
+    def test_49_achat_retries_transient_failures(self):
+        """Test 49: achat retries connection errors, timeouts and 5xx, sleeping without the semaphore"""
+        import aiohttp
+        ok = (200, {"choices": [{"message": {"content": "hello"}}]})
+        reply, post, sleeps = self._run_achat([
+            aiohttp.ClientConnectionError("reset"), asyncio.TimeoutError(), (503, "busy"), ok
+        ])
+        self.assertEqual(reply, "hello")
+        self.assertEqual(post.call_count, 4)
+        self.assertEqual(sleeps, [(1, False), (2, False), (4, False)])
+    
+    def test_50_achat_gives_up(self):
+        """Test 50: achat raises at once on a 4xx, and after max_retries on persistent 5xx"""
+        reply, post, sleeps = self._run_achat([(400, "bad request")])
+        self.assertIn("Qwen API error: 400", str(reply))
+        self.assertEqual((post.call_count, sleeps), (1, []))
+        
+        reply, post, sleeps = self._run_achat([(500, "down")] * (self.client.max_retries + 1))
+        self.assertIn("Qwen API error: 500", str(reply))
+        self.assertEqual(post.call_count, self.client.max_retries + 1)
+    
+    def test_51_async_session_rebinds_per_loop(self):
+        """Test 51: A new event loop gets a new session and the old one is closed"""
+        async def resources():
+            return await self.client._get_async_resources()
+        
+        first, _ = asyncio.run(resources())
+        second, _ = asyncio.run(resources())
+        try:
+            self.assertIsNot(first, second)
+            self.assertTrue(first.closed)
+            self.assertFalse(second.closed)
+        finally:
+            asyncio.run(self.client.aclose())
+        self.assertTrue(second.closed)
+
+
+class StubEmbedder:
+    """sentence-transformers stand-in returning fixed unit vectors and counting calls"""
+    
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+    
+    def encode(self, text, normalize_embeddings=True):
+        import numpy as np
+        self.calls.append(text)
+        vector = np.asarray(self.vectors[text], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the Qwen response cache (no API calls)"""
+    
+    MODEL = "qwen-plus"
+    
+    @staticmethod
+    def _messages(question, system="You are a fact-checker."):
+        return [{"role": "system", "content": system}, {"role": "user", "content": question}]
+    
+    def _semantic_cache(self, vectors, **kwargs):
+        """Cache with its semantic tier backed by a StubEmbedder"""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy not installed")
+        from modules.response_cache import ResponseCache
+        cache = ResponseCache(**kwargs)
+        cache._encoder = StubEmbedder(vectors)
+        cache.use_semantic = True
+        return cache
+    
+    def test_36_exact_hit_and_miss(self):
+        """Test 36: Identical requests hit; a different temperature or output mode misses"""
+        from modules.response_cache import ResponseCache
+        cache = ResponseCache()
+        messages = self._messages("Is water wet?")
+        cache.set(self.MODEL, messages, 0.7, "Yes")
+        
+        self.assertEqual(cache.get(self.MODEL, [dict(m) for m in messages], 0.7), "Yes")
+        self.assertIsNone(cache.get(self.MODEL, messages, 0.3))
+        self.assertIsNone(cache.get(self.MODEL, messages, 0.7, {"type": "json_object"}))
+        self.assertEqual(cache.stats(), {"entries": 1, "hits": 1, "semantic_hits": 0, "misses": 2})
+    
+    def test_37_ttl_expiry(self):
+        """Test 37: Entries expire ttl_seconds after they were stored"""
+        from modules.response_cache import ResponseCache
+        cache = ResponseCache(ttl_seconds=60)
+        messages = self._messages("Is water wet?")
+        with mock.patch("modules.response_cache.time.time", return_value=1000.0):
+            cache.set(self.MODEL, messages, 0.7, "Yes")
+        with mock.patch("modules.response_cache.time.time", return_value=1060.0):
+            self.assertEqual(cache.get(self.MODEL, messages, 0.7), "Yes")
+        with mock.patch("modules.response_cache.time.time", return_value=1060.5):
+            self.assertIsNone(cache.get(self.MODEL, messages, 0.7))
+        self.assertEqual(cache.stats()["entries"], 0)
+    
+    def test_38_lru_eviction(self):
+        """Test 38: The least recently used entry is evicted past max_entries"""
+        from modules.response_cache import ResponseCache
+        cache = ResponseCache(max_entries=2)
+        first, second, third = (self._messages(q) for q in ("first?", "second?", "third?"))
+        cache.set(self.MODEL, first, 0.7, "1")
+        cache.set(self.MODEL, second, 0.7, "2")
+        cache.get(self.MODEL, first, 0.7)  # first is now the most recently used
+        cache.set(self.MODEL, third, 0.7, "3")
+        
+        self.assertEqual(cache.get(self.MODEL, first, 0.7), "1")
+        self.assertIsNone(cache.get(self.MODEL, second, 0.7))
+        self.assertEqual(cache.get(self.MODEL, third, 0.7), "3")
+    
+    def test_39_semantic_threshold(self):
+        """Test 39: Near-duplicate prompts hit at or above the threshold, in the same scope only"""
+        cache = self._semantic_cache({
+            "What is the capital of France?": [1.0, 0.0, 0.0],
+            "what's the capital of France": [0.99, 0.14, 0.0],   # cosine ~0.99
+            "What is the capital of Spain?": [0.9, 0.44, 0.0],   # cosine ~0.90
+        }, similarity_threshold=0.97)
+        cache.set(self.MODEL, self._messages("What is the capital of France?"), 0.7, "Paris")
+        
+        self.assertEqual(cache.get(self.MODEL, self._messages("what's the capital of France"), 0.7), "Paris")
+        self.assertIsNone(cache.get(self.MODEL, self._messages("What is the capital of Spain?"), 0.7))
+        # Same question under a different system prompt is a different scope
+        self.assertIsNone(cache.get(
+            self.MODEL, self._messages("what's the capital of France", system="Answer in French."), 0.7
+        ))
+        self.assertEqual(cache.stats()["semantic_hits"], 1)
+    
+    def test_40_semantic_miss_embeds_once(self):
+        """Test 40: set() after a semantic miss reuses the embedding get() computed"""
+        cache = self._semantic_cache({
+            "What is the capital of France?": [1.0, 0.0, 0.0],
+            "What is the capital of Spain?": [0.9, 0.44, 0.0],
+        })
+        cache.set(self.MODEL, self._messages("What is the capital of France?"), 0.7, "Paris")
+        spain = self._messages("What is the capital of Spain?")
+        self.assertIsNone(cache.get(self.MODEL, spain, 0.7))
+        cache.set(self.MODEL, spain, 0.7, "Madrid")
+        
+        self.assertEqual(cache._encoder.calls.count("What is the capital of Spain?"), 1)
+        self.assertEqual(cache.get(self.MODEL, spain, 0.7), "Madrid")
+    
+    def test_53_async_semantic_lookup_off_loop(self):
+        """Test 53: achat's cache embeds in an executor; exact hits are served without embedding"""
+        from modules.response_cache import cached_response
+        cache = self._semantic_cache({
+            "What is the capital of France?": [1.0, 0.0, 0.0],
+            "What is the capital of Spain?": [0.9, 0.44, 0.0],
+        })
+        cache.set(self.MODEL, self._messages("What is the capital of France?"), 0.7, "Paris")
+        encoder = cache._encoder
+        encode_threads = []
+        
+        def encode(text, normalize_embeddings=True):
+            encode_threads.append(threading.get_ident())
+            return StubEmbedder.encode(encoder, text, normalize_embeddings)
+        
+        encoder.encode = encode
+        
+        class Client:
+            model = self.MODEL
+            
+            def __init__(self):
+                self.cache = cache
+                self.calls = 0
+            
+            @cached_response
+            async def achat(self, messages, temperature=0.7, response_format=None):
+                self.calls += 1
+                return "Madrid"
+        
+        async def ask_twice(client, messages):
+            return threading.get_ident(), [await client.achat(messages), await client.achat(messages)]
+        
+        client = Client()
+        loop_thread, answers = asyncio.run(ask_twice(client, self._messages("What is the capital of Spain?")))
+        
+        self.assertEqual(answers, ["Madrid", "Madrid"])
+        self.assertEqual(client.calls, 1)
+        # One embedding for the miss (reused by set); the repeat is an exact hit
+        self.assertEqual(len(encode_threads), 1)
+        self.assertNotEqual(encode_threads[0], loop_thread)
+        self.assertEqual(cache.stats()["hits"], 1)
+
 
 class TestInputProcessor(unittest.TestCase):
     """Test Input Processor"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.processor = SimpleInputProcessor()
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for the class"""
+        cls.processor = SimpleInputProcessor()
     
     def test_04_text_processing(self):
         """Test 4: Text input processing"""
@@ -93,8 +529,7 @@ class TestInputProcessor(unittest.TestCase):
     
     def test_06_long_text_processing(self):
         """Test 6: Long text processing"""
-        long_text = "Test " * 1000
-        result = self.processor.process(long_text, "text")
+        result = self.processor.process(LONG_TEXT, "text")
         self.assertIsInstance(result['text'], str)
         self.assertEqual(result['type'], 'direct')
     
@@ -106,32 +541,232 @@ class TestInputProcessor(unittest.TestCase):
     
     def test_08_url_validation(self):
         """Test 8: URL processing structure"""
-        # Test with a simple URL (may fail to fetch, but should return proper structure)
-        try:
+        response = mock.Mock(status_code=200, text=EXAMPLE_HTML, headers={})
+        session = mock.Mock()
+        session.get.return_value = response
+        
+        # Canned page, and no URL cache so nothing real is read or written
+        with mock.patch('modules.input_processor._get_session', return_value=session), \
+                mock.patch.object(self.processor, 'url_cache', UrlCache(enabled=False)):
             result = self.processor.process("https://example.com", "url")
-            self.assertIn('text', result)
-            self.assertIn('type', result)
-            self.assertEqual(result['type'], 'article')
-        except Exception as e:
-            # URL processing may fail in test environment
-            self.assertIsInstance(e, Exception)
+        
+        self.assertIn('text', result)
+        self.assertIn('type', result)
+        self.assertEqual(result['type'], 'article')
+        self.assertTrue(result['text'])
     
     def test_09_invalid_input_type(self):
         """Test 9: Invalid input type raises error"""
         with self.assertRaises(ValueError):
             self.processor.process("test", "invalid_type")
+    
+    def test_09b_exif_orientation_applied(self):
+        """Test 9b: Downscaled images are rotated upright per their EXIF orientation"""
+        from PIL import Image
+        from modules.input_processor import _IMAGE_MAX_SIDE
+        
+        # Stored landscape, tagged "rotate 90° clockwise to display" (orientation 6)
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = io.BytesIO()
+        Image.new('RGB', (_IMAGE_MAX_SIDE * 2, _IMAGE_MAX_SIDE), 'white').save(buffer, format='JPEG', exif=exif)
+        data = buffer.getvalue()
+        
+        shrunk = Image.open(io.BytesIO(self.processor._shrink_image(data)))
+        self.assertEqual(shrunk.size, (_IMAGE_MAX_SIDE // 2, _IMAGE_MAX_SIDE))
+        
+        prepared = self.processor._prepare_for_ocr(Image.open(io.BytesIO(data)))
+        self.assertLess(prepared.width, prepared.height)
+        self.assertLessEqual(max(prepared.size), _IMAGE_MAX_SIDE)
+    
+    def _url_cache(self):
+        """Empty on-disk UrlCache in a temporary directory"""
+        import tempfile
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        url_cache = UrlCache(directory=directory.name, max_age_seconds=3600)
+        if not url_cache.enabled:
+            self.skipTest("diskcache not installed")
+        self.addCleanup(url_cache._cache.close)
+        return url_cache
+    
+    def _fetch_url(self, url_cache, response, use_async):
+        """
+        Run _process_url (or _process_url_async) against a mocked HTTP client
+        
+        Returns:
+            Tuple of (result, mocked get method, mocked _parse_html)
+        """
+        parse = mock.Mock(side_effect=lambda url, html: {'text': html, 'type': 'article', 'source': url})
+        with mock.patch.object(self.processor, 'url_cache', url_cache), \
+                mock.patch.object(self.processor, '_parse_html', parse):
+            if use_async:
+                client = mock.Mock()
+                client.get = mock.AsyncMock(return_value=response)
+                with mock.patch('modules.input_processor._get_async_client', return_value=client):
+                    result = asyncio.run(self.processor._process_url_async("https://example.com/a"))
+            else:
+                client = mock.Mock()
+                client.get.return_value = response
+                with mock.patch('modules.input_processor._get_session', return_value=client):
+                    result = self.processor._process_url("https://example.com/a")
+        return result, client.get, parse
+    
+    @staticmethod
+    def _store_stale(url_cache, url, result):
+        """Store an entry fetched two hours ago with ETag and Last-Modified validators"""
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        with mock.patch('modules.url_cache.time.time', return_value=time.time() - 7200):
+            url_cache.store(url, result, headers)
+    
+    def test_09c_url_cache_fresh_hit(self):
+        """Test 9c: A fresh cached URL is served without a request"""
+        url = "https://example.com/a"
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async):
+                url_cache = self._url_cache()
+                url_cache.store(url, {'text': 'cached'}, {})
+                result, get, parse = self._fetch_url(url_cache, mock.Mock(), use_async)
+                self.assertEqual(result, {'text': 'cached'})
+                get.assert_not_called()
+                parse.assert_not_called()
+    
+    def test_09d_url_cache_304_revalidation(self):
+        """Test 9d: A stale URL is revalidated; 304 reuses the cached body and refreshes it"""
+        url = "https://example.com/a"
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async):
+                url_cache = self._url_cache()
+                self._store_stale(url_cache, url, {'text': 'cached'})
+                self.assertFalse(url_cache.is_fresh(url_cache.get(url)))
+                
+                response = mock.Mock(status_code=304, text='', headers={})
+                with mock.patch.object(url_cache, 'touch', wraps=url_cache.touch) as touch:
+                    result, get, parse = self._fetch_url(url_cache, response, use_async)
+                
+                self.assertEqual(result, {'text': 'cached'})
+                self.assertEqual(get.call_args.kwargs['headers'], {
+                    'If-None-Match': '"v1"',
+                    'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+                })
+                parse.assert_not_called()
+                touch.assert_called_once()
+                entry = url_cache.get(url)
+                self.assertTrue(url_cache.is_fresh(entry))
+                self.assertEqual((entry['result'], entry['etag']), ({'text': 'cached'}, '"v1"'))
+    
+    def test_09e_url_cache_200_replaces_entry(self):
+        """Test 9e: A stale URL answered with 200 is re-parsed and replaces the cached entry"""
+        url = "https://example.com/a"
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async):
+                url_cache = self._url_cache()
+                self._store_stale(url_cache, url, {'text': 'cached'})
+                
+                response = mock.Mock(status_code=200, text='updated', headers={'ETag': '"v2"'})
+                result, get, parse = self._fetch_url(url_cache, response, use_async)
+                
+                self.assertEqual(result['text'], 'updated')
+                parse.assert_called_once_with(url, 'updated')
+                entry = url_cache.get(url)
+                self.assertTrue(url_cache.is_fresh(entry))
+                self.assertEqual(entry['result'], result)
+                self.assertEqual(entry['etag'], '"v2"')
+                self.assertIsNone(entry['last_modified'])
+
+
+class TestQwenVisionClient(unittest.TestCase):
+    """Test Qwen Vision Client response parsing (no API calls)"""
+    
+    def test_34_split_batch_answers(self):
+        """Test 34: Batch answers split on markers, same-line or next-line"""
+        from modules.qwen_vision_client import QwenVisionClient
+        split = QwenVisionClient._split_batch_answers
+        
+        self.assertEqual(
+            split("### Answer 1: A red car\n### Answer 2. Two people\n#### answer 3) Paris", 3),
+            {1: "A red car", 2: "Two people", 3: "Paris"}
+        )
+        self.assertEqual(
+            split("### Answer 1\nA red car\nparked outside\n\n### Answer 2:\nTwo people", 2),
+            {1: "A red car\nparked outside", 2: "Two people"}
+        )
+    
+    def test_35_split_batch_answers_duplicate_and_missing(self):
+        """Test 35: First of duplicate markers wins; missing or out-of-range answers are left out"""
+        from modules.qwen_vision_client import QwenVisionClient
+        split = QwenVisionClient._split_batch_answers
+        
+        self.assertEqual(split("### Answer 1: first\n### Answer 1: second", 1), {1: "first"})
+        self.assertEqual(split("### Answer 1: yes\n### Answer 3: no\n### Answer 4: extra", 3), {1: "yes", 3: "no"})
+        self.assertEqual(split("### Answer 1:\n### Answer 2: no", 2), {2: "no"})
+        self.assertEqual(split("No markers at all", 2), {})
+    
+    def test_41_completed_string_field(self):
+        """Test 41: A string field is returned only once its closing quote arrives"""
+        from modules.qwen_vision_client import _completed_string_field
+        
+        self.assertEqual(
+            _completed_string_field('{"visible_text": "He said \\"hi\\" \\\\ bye", "main', 'visible_text'),
+            'He said "hi" \\ bye'
+        )
+        self.assertIsNone(_completed_string_field('{"visible_text": "He said \\"hi\\"', 'visible_text'))
+        self.assertIsNone(_completed_string_field('{"visible_text": "ends in \\', 'visible_text'))
+        self.assertIsNone(_completed_string_field('{"main_claim": "no visible text"}', 'visible_text'))
+        self.assertEqual(_completed_string_field('{"visible_text"\n  :  "spaced"', 'visible_text'), 'spaced')
+    
+    def _collect(self, chunks):
+        """Run _collect_claims over chunks, returning (result, on_text mock)"""
+        from modules.qwen_vision_client import QwenVisionClient
+        on_text = mock.Mock()
+        with mock.patch.dict(os.environ, {"DASHSCOPE_API_KEY": "sk-test", "VISION_CACHE_ENABLED": "0"}):
+            client = QwenVisionClient()
+        return client._collect_claims(iter(chunks), on_text), on_text
+    
+    def test_42_collect_claims_split_chunks(self):
+        """Test 42: on_text fires once, with escapes and the key split across chunks"""
+        chunks = ['{"visi', 'ble_text"', ' : ', '"say \\', '"cheese\\', '" now"', ', "main_claim": "m"}']
+        result, on_text = self._collect(chunks)
+        on_text.assert_called_once_with('say "cheese" now')
+        self.assertEqual(result['visible_text'], 'say "cheese" now')
+        self.assertEqual(result['main_claim'], 'm')
+        
+        # One character at a time, and a field that never appears
+        text = '{"main_claim": "a \\"visible_text\\": b", "visible_text": "x\\ny"}'
+        result, on_text = self._collect(list(text))
+        on_text.assert_called_once_with('x\ny')
+        result, on_text = self._collect(['{"main_claim": ', '"m"}'])
+        on_text.assert_not_called()
+    
+    def test_43_on_text_once_on_cache_hit(self):
+        """Test 43: A cached extraction calls on_text once without calling the API"""
+        from modules.qwen_vision_client import QwenVisionClient
+        with mock.patch.dict(os.environ, {"DASHSCOPE_API_KEY": "sk-test", "VISION_CACHE_ENABLED": "0"}):
+            client = QwenVisionClient()
+        cached = {'visible_text': 'cached text', 'main_claim': 'claim'}
+        on_text = mock.Mock()
+        analyze = mock.Mock()
+        with mock.patch.object(client, 'cache') as cache:
+            cache.get.return_value = cached
+            self.assertIs(client._cached_claims('key', analyze, on_text), cached)
+        on_text.assert_called_once_with('cached text')
+        analyze.assert_not_called()
 
 
+@network_test
 class TestClaimExtractor(unittest.TestCase):
     """Test Claim Extractor"""
     
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for the class"""
         try:
-            self.extractor = ClaimExtractor()
-            self.qwen_available = True
+            cls.extractor = ClaimExtractor()
+            # Patch this instance only; other classes may run concurrently
+            cls.extractor.extract_claims = cached_llm(cls.extractor.extract_claims)
+            cls.qwen_available = True
         except Exception:
-            self.qwen_available = False
+            cls.qwen_available = False
     
     def test_10_claim_extraction_structure(self):
         """Test 10: Claim extraction returns correct structure"""
@@ -161,12 +796,48 @@ class TestClaimExtractor(unittest.TestCase):
         self.assertIn('main_claim', result)
 
 
+class TestClaimExtractorOffline(unittest.TestCase):
+    """Test the claim extractor's local fast path (no API calls)"""
+    
+    def test_52_async_fast_path_off_loop(self):
+        """Test 52: The async local fast path runs spaCy in an executor, not on the event loop"""
+        nlp_threads = []
+        
+        def fake_nlp(text):
+            nlp_threads.append(threading.get_ident())
+            return SimpleNamespace(ents=[SimpleNamespace(text="Paris", label_="GPE")])
+        
+        async def extract(extractor):
+            return threading.get_ident(), await extractor.extract_claims_async("The Eiffel Tower is in Paris")
+        
+        qwen = mock.Mock()
+        with mock.patch('modules.claim_extractor._get_nlp', return_value=fake_nlp), \
+                mock.patch('modules.claim_extractor.search_dates', None):
+            loop_thread, result = asyncio.run(extract(ClaimExtractor(qwen=qwen)))
+        
+        self.assertEqual(result['main_claim'], "The Eiffel Tower is in Paris")
+        self.assertEqual(result['entities'], ["Paris"])
+        self.assertEqual(len(nlp_threads), 1)
+        self.assertNotEqual(nlp_threads[0], loop_thread)
+        qwen.aextract_json_response.assert_not_called()
+
+
 class TestSearchEngine(unittest.TestCase):
     """Test Search Engine"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.search_engine = MVPSearchEngine()
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for the class"""
+        # Serve DuckDuckGo from canned results; skip Google and the result cache
+        cls._ddgs_patcher = mock.patch('modules.search_engine.DDGS', FakeDDGS)
+        cls._ddgs_patcher.start()
+        cls.search_engine = MVPSearchEngine()
+        cls.search_engine.google_api_key = None
+        cls.search_engine.cache = None
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._ddgs_patcher.stop()
     
     def test_13_search_engine_initialization(self):
         """Test 13: Search engine initializes correctly"""
@@ -176,53 +847,230 @@ class TestSearchEngine(unittest.TestCase):
     
     def test_14_duckduckgo_search(self):
         """Test 14: DuckDuckGo search returns results"""
-        try:
-            results = self.search_engine.search_duckduckgo("water boils 100 celsius", max_results=2)
-            self.assertIsInstance(results, list)
-            if len(results) > 0:
-                self.assertIn('title', results[0])
-                self.assertIn('url', results[0])
-        except Exception:
-            # Search may fail in restricted environments
-            self.skipTest("Search not available in test environment")
+        results = self.search_engine.search_duckduckgo("water boils 100 celsius", max_results=2)
+        self.assertIsInstance(results, list)
+        self.assertEqual(len(results), 2)
+        self.assertIn('title', results[0])
+        self.assertIn('url', results[0])
+        self.assertEqual(results[0]['source'], 'duckduckgo')
     
     def test_15_search_multiple_sources(self):
         """Test 15: Multi-source search aggregates results"""
-        try:
-            results = self.search_engine.search_multiple_sources("climate change", max_results=3)
-            self.assertIsInstance(results, list)
-            self.assertLessEqual(len(results), 3)
-        except Exception:
-            self.skipTest("Search not available in test environment")
+        results = self.search_engine.search_multiple_sources("climate change", max_results=3)
+        self.assertIsInstance(results, list)
+        self.assertGreater(len(results), 0)
+        self.assertLessEqual(len(results), 3)
     
     def test_16_search_and_verify_structure(self):
         """Test 16: Search and verify returns correct structure"""
+        result = self.search_engine.search_and_verify(TEST_CLAIMS)
+        self.assertIn('direct_evidence', result)
+        self.assertIn('context', result)
+        self.assertIn('existing_factchecks', result)
+    
+    def test_16b_match_factcheck_site(self):
+        """Test 16b: URLs map to their fact-check site, honouring path-scoped sites"""
+        match = self.search_engine._match_factcheck_site
+        self.assertEqual(match("https://www.snopes.com/fact-check/water/"), "snopes.com")
+        self.assertEqual(match("https://SNOPES.com/x"), "snopes.com")
+        self.assertEqual(match("https://www.reuters.com/fact-check/claim-idUS123"), "reuters.com/fact-check")
+        self.assertEqual(match("https://apnews.com/ap-fact-check/claim"), "apnews.com/ap-fact-check")
+        self.assertIsNone(match("https://www.reuters.com/world/europe/story"))
+        self.assertIsNone(match("https://notsnopes.com/fact-check/water/"))
+        self.assertIsNone(match("https://example.com/?u=snopes.com"))
+        self.assertIsNone(match("http://[::1"))
+        self.assertIsNone(match(""))
+    
+    def test_16c_factcheck_sites_google(self):
+        """Test 16c: With Google configured, one OR'd site: query is made and results are tagged"""
+        google_results = [
+            {'title': 'Snopes', 'url': 'https://www.snopes.com/fact-check/water/'},
+            {'title': 'Reuters news', 'url': 'https://www.reuters.com/world/story'},
+            {'title': 'Reuters fact check', 'url': 'https://www.reuters.com/fact-check/water'},
+            {'title': 'Blog', 'url': 'https://blog.example.com/water'}
+        ]
+        engine = self.search_engine
+        expected_query = (
+            "(site:snopes.com OR site:factcheck.org OR site:politifact.com OR "
+            "site:reuters.com/fact-check OR site:apnews.com/ap-fact-check OR site:fullfact.org) water boils"
+        )
+        
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async), \
+                    mock.patch.object(engine, 'google_api_key', 'key'), \
+                    mock.patch.object(engine, 'google_cse_id', 'cx'), \
+                    mock.patch.object(engine, 'search_duckduckgo') as ddg:
+                if use_async:
+                    with mock.patch.object(engine, 'asearch_google', mock.AsyncMock(
+                            return_value=[dict(r) for r in google_results])) as google:
+                        results = asyncio.run(engine.acheck_factcheck_sites("water boils"))
+                else:
+                    with mock.patch.object(engine, 'search_google',
+                                           return_value=[dict(r) for r in google_results]) as google:
+                        results = engine.check_factcheck_sites("water boils")
+                
+                google.assert_called_once_with(expected_query, max_results=10)
+                ddg.assert_not_called()
+                self.assertEqual(
+                    [(r['title'], r['factcheck_source']) for r in results],
+                    [('Snopes', 'snopes.com'), ('Reuters fact check', 'reuters.com/fact-check')]
+                )
+                self.assertTrue(all(r['factcheck_site'] for r in results))
+    
+    def test_16d_factcheck_sites_ddg_fallback(self):
+        """Test 16d: When Google returns no fact-checks, DuckDuckGo is searched per site"""
+        engine = self.search_engine
+        for use_async in (False, True):
+            with self.subTest(use_async=use_async), \
+                    mock.patch.object(engine, 'google_api_key', 'key'), \
+                    mock.patch.object(engine, 'google_cse_id', 'cx'), \
+                    mock.patch.object(engine, 'search_google', return_value=[]), \
+                    mock.patch.object(engine, 'asearch_google', mock.AsyncMock(return_value=[])), \
+                    mock.patch.object(engine, 'search_duckduckgo', wraps=engine.search_duckduckgo) as ddg:
+                if use_async:
+                    results = asyncio.run(engine.acheck_factcheck_sites("water boils"))
+                else:
+                    results = engine.check_factcheck_sites("water boils")
+                
+                self.assertEqual(
+                    sorted(call.args[0] for call in ddg.call_args_list),
+                    ["site:factcheck.org water boils", "site:politifact.com water boils", "site:snopes.com water boils"]
+                )
+                # Two canned results per site, tagged in site order
+                self.assertEqual(
+                    [r['factcheck_source'] for r in results],
+                    ["snopes.com"] * 2 + ["factcheck.org"] * 2 + ["politifact.com"] * 2
+                )
+                self.assertTrue(all(r['factcheck_site'] for r in results))
+    
+    def test_16e_search_key_facts(self):
+        """Test 16e: Up to SEARCH_KEY_FACT_FANOUT checkable key facts are searched, none when off"""
+        engine = self.search_engine
         claims = {
-            'main_claim': 'Test claim',
-            'key_facts': [],
-            'entities': [],
-            'dates_mentioned': []
+            'main_claim': 'Water boils at 100C',
+            'key_facts': [
+                {'claim': 'Water boils at 100C', 'checkable': True},
+                {'claim': 'Boiling point drops with altitude', 'checkable': True},
+                {'claim': 'Tea tastes better', 'checkable': False},
+                {'claim': 'Sea level pressure is 1 atm', 'checkable': True},
+                {'claim': 'Everest base camp is high', 'checkable': True}
+            ]
         }
-        try:
-            result = self.search_engine.search_and_verify(claims)
-            self.assertIn('direct_evidence', result)
-            self.assertIn('context', result)
-            self.assertIn('existing_factchecks', result)
-        except Exception:
-            self.skipTest("Search not available in test environment")
+        with mock.patch.object(engine, 'search_multiple_sources',
+                               side_effect=lambda query, max_results: [{'title': query, 'url': ''}]) as search:
+            with mock.patch.object(engine, 'key_fact_fanout', 0):
+                self.assertEqual(engine.search_key_facts(claims), [])
+            search.assert_not_called()
+            
+            with mock.patch.object(engine, 'key_fact_fanout', 2):
+                results = engine.search_key_facts(claims)
+        
+        self.assertEqual(
+            [r['title'] for r in results],
+            ['Boiling point drops with altitude', 'Sea level pressure is 1 atm']
+        )
+
+
+class TestSearchCache(unittest.TestCase):
+    """Test the search result cache and its decorator (no network)"""
+    
+    def _search_cache(self, **kwargs):
+        """SearchCache in a temporary directory"""
+        import tempfile
+        from modules.search_cache import SearchCache
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = SearchCache(directory=directory.name, **kwargs)
+        if cache._disk is not None:
+            self.addCleanup(cache._disk.close)
+        return cache
+    
+    @staticmethod
+    def _engine(cache, results):
+        """Object with a cached_search-decorated sync and async search, counting real calls"""
+        from modules.search_cache import cached_search
+        
+        class Engine:
+            calls = []
+            
+            @cached_search("test")
+            def search(self, query, max_results=5):
+                self.calls.append((query, max_results))
+                return [dict(result) for result in results]
+            
+            @cached_search("test")
+            async def asearch(self, query, max_results=5):
+                self.calls.append((query, max_results))
+                return [dict(result) for result in results]
+        
+        engine = Engine()
+        engine.calls = []
+        engine.cache = cache
+        return engine
+    
+    def test_44_cached_search_hit_and_miss(self):
+        """Test 44: Repeated queries are served from the cache; other queries or counts miss"""
+        engine = self._engine(self._search_cache(), DDG_SAMPLE_RESULTS[:1])
+        
+        first = engine.search("water boils")
+        first[0]['title'] = 'mutated by caller'
+        self.assertEqual(engine.search("water boils"), DDG_SAMPLE_RESULTS[:1])
+        engine.search("water boils", max_results=3)
+        engine.search("ice melts")
+        self.assertEqual(engine.calls, [("water boils", 5), ("water boils", 3), ("ice melts", 5)])
+        
+        self.assertEqual(asyncio.run(engine.asearch("sea level")), DDG_SAMPLE_RESULTS[:1])
+        asyncio.run(engine.asearch("sea level"))
+        self.assertEqual(len(engine.calls), 4)
+    
+    def test_45_cached_search_skips_empty_results(self):
+        """Test 45: Empty result lists are not cached"""
+        engine = self._engine(self._search_cache(), [])
+        self.assertEqual(engine.search("no results"), [])
+        self.assertEqual(engine.search("no results"), [])
+        asyncio.run(engine.asearch("no results"))
+        asyncio.run(engine.asearch("no results"))
+        self.assertEqual(len(engine.calls), 4)
+    
+    def test_46_cached_search_disabled(self):
+        """Test 46: Without a cache, or with it disabled, every query runs the search"""
+        for cache in (None, self._search_cache(enabled=False)):
+            with self.subTest(cache=cache):
+                engine = self._engine(cache, DDG_SAMPLE_RESULTS[:1])
+                engine.search("water boils")
+                engine.search("water boils")
+                asyncio.run(engine.asearch("water boils"))
+                self.assertEqual(len(engine.calls), 3)
+    
+    def test_47_disk_hit_keeps_remaining_ttl(self):
+        """Test 47: A disk hit is promoted to memory with the entry's remaining TTL"""
+        cache = self._search_cache(ttl_seconds=100)
+        if cache._disk is None:
+            self.skipTest("diskcache not installed")
+        set_at = time.time()
+        cache.set("key", ["result"])
+        cache._memory.clear()
+        
+        # Read back 60s later: the memory copy must expire with the disk entry
+        with mock.patch("modules.tiered_cache.time.time", return_value=set_at + 60):
+            self.assertEqual(cache.get("key"), ["result"])
+        expires_at, _ = cache._memory["key"]
+        self.assertLess(expires_at, set_at + 101)
+        self.assertGreater(expires_at, set_at + 99)
 
 
 class TestContextAnalyzer(unittest.TestCase):
     """Test Context Analyzer"""
     
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for the class"""
         try:
-            self.analyzer = ContextAnalyzer()
-            self.qwen_available = True
-        except Exception as e:
-            self.qwen_available = False
-            self.analyzer = None
+            cls.analyzer = ContextAnalyzer()
+            cls.qwen_available = True
+        except Exception:
+            cls.qwen_available = False
+            cls.analyzer = None
     
     def test_17_context_analyzer_initialization(self):
         """Test 17: Context analyzer initializes correctly"""
@@ -253,28 +1101,50 @@ class TestContextAnalyzer(unittest.TestCase):
         """Test 20: Context analysis returns correct structure"""
         if not self.qwen_available or not self.analyzer:
             self.skipTest("Qwen not available")
-        claim = "Test claim"
-        search_results = {
-            'direct_evidence': [],
-            'context': [],
-            'existing_factchecks': []
-        }
         try:
-            result = self.analyzer.analyze_context(claim, search_results)
+            result = self.analyzer.analyze_context(TEST_CLAIMS['main_claim'], EMPTY_EVIDENCE)
             self.assertIn('missing_context', result)
             self.assertIn('full_picture', result)
             self.assertIn('timeline', result)
         except Exception:
             # May fail without proper API or search results
             pass
+    
+    def test_20b_find_date_strings_formats(self):
+        """Test 20b: Every date format is found once, in order and in any case"""
+        from modules.context_analyzer import _find_date_strings
+        text = (
+            "Filed JANUARY 15, 2024 and amended jan 20 2024; hearings on 2023-12-01, "
+            "12/31/2023 and 1-2-24, then Sept 5, 2023 and MAR 3 2021."
+        )
+        self.assertEqual(
+            _find_date_strings.__wrapped__(text),
+            ("JANUARY 15, 2024", "jan 20 2024", "2023-12-01", "12/31/2023", "1-2-24",
+             "Sept 5, 2023", "MAR 3 2021")
+        )
+        # Full month names match both month patterns but are reported once
+        self.assertEqual(_find_date_strings.__wrapped__("On March 3, 2021."), ("March 3, 2021",))
+        # Not dates: numbers without a date shape, or dates glued to other digits
+        self.assertEqual(_find_date_strings.__wrapped__("Call 555-1234 about 2023/12/011 or 123-45-6789"), ())
+    
+    def test_20c_find_date_strings_prefilter(self):
+        """Test 20c: Text without two adjacent digits skips the date regex"""
+        import modules.context_analyzer as context_analyzer
+        with mock.patch.object(context_analyzer, '_DATE_RE') as date_re:
+            self.assertEqual(context_analyzer._find_date_strings.__wrapped__("No dates here"), ())
+            self.assertEqual(context_analyzer._find_date_strings.__wrapped__("Chapter 1, verse 2 of 3"), ())
+            date_re.finditer.assert_not_called()
+            context_analyzer._find_date_strings.__wrapped__("Chapter 12")
+            date_re.finditer.assert_called_once_with("Chapter 12")
 
 
 class TestVerifier(unittest.TestCase):
     """Test Verifier"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.verifier = SimpleVerifier()
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for the class"""
+        cls.verifier = SimpleVerifier()
     
     def test_21_verifier_initialization(self):
         """Test 21: Verifier initializes with reputable domains"""
@@ -316,6 +1186,16 @@ class TestVerifier(unittest.TestCase):
         score = self.verifier.check_source_quality(evidence)
         self.assertGreaterEqual(score, 0.0)
     
+    def test_25b_reputable_domain_matching(self):
+        """Test 25b: Reputable matching is by host label, not substring"""
+        self.assertTrue(self.verifier.is_reputable('https://www.reuters.com/world/article'))
+        self.assertTrue(self.verifier.is_reputable('https://news.BBC.com/story'))
+        self.assertTrue(self.verifier.is_reputable('https://www.gov.uk/guidance'))
+        self.assertFalse(self.verifier.is_reputable('https://notreuters.com/article'))
+        self.assertFalse(self.verifier.is_reputable('https://reuters.com.example.net/article'))
+        self.assertFalse(self.verifier.is_reputable('https://example.com/?ref=bbc.com'))
+        self.assertFalse(self.verifier.is_reputable('not a url'))
+    
     def test_26_context_scoring(self):
         """Test 26: Context completeness scoring"""
         context = {
@@ -339,14 +1219,12 @@ class TestVerifier(unittest.TestCase):
     
     def test_28_verdict_determination_high_confidence(self):
         """Test 28: Verdict with high confidence"""
-        evidence = {'existing_factchecks': []}
-        verdict = self.verifier.determine_verdict(0.8, evidence)
+        verdict = self.verifier.determine_verdict(0.8, EMPTY_EVIDENCE)
         self.assertEqual(verdict, "LIKELY TRUE")
     
     def test_29_verdict_determination_low_confidence(self):
         """Test 29: Verdict with low confidence"""
-        evidence = {'existing_factchecks': []}
-        verdict = self.verifier.determine_verdict(0.2, evidence)
+        verdict = self.verifier.determine_verdict(0.2, EMPTY_EVIDENCE)
         self.assertEqual(verdict, "LIKELY FALSE OR MISLEADING")
     
     def test_30_calculate_verdict_complete(self):
@@ -371,11 +1249,85 @@ class TestVerifier(unittest.TestCase):
         self.assertIsInstance(result['confidence'], (int, float))
         self.assertGreaterEqual(result['confidence'], 0.0)
         self.assertLessEqual(result['confidence'], 1.0)
+    
+    def test_30b_calculate_verdict_batch_matches_single(self):
+        """Test 30b: Batch verdicts equal calculate_verdict per claim, around every threshold"""
+        evidences, contexts = [], []
+        for reputable in range(4):
+            for other in range(4):
+                for factchecks in range(3):
+                    evidence = {
+                        'direct_evidence': (
+                            [{'url': f'https://reuters.com/article-{i}'} for i in range(reputable)]
+                            + [{'url': f'https://blog{i}.example.com/post'} for i in range(other)]
+                        ),
+                        'context': [],
+                        'existing_factchecks': [{'url': f'https://snopes.com/fact-check/{i}'} for i in range(factchecks)]
+                    }
+                    for missing in ([], ['context point']):
+                        for full_picture in ('', 'Summary'):
+                            for timeline in ([], ['2020']):
+                                evidences.append(evidence)
+                                contexts.append({
+                                    'missing_context': missing,
+                                    'full_picture': full_picture,
+                                    'timeline': timeline
+                                })
+        claims = ["Test claim"] * len(evidences)
+        
+        batch = self.verifier.calculate_verdict_batch(claims, evidences, contexts)
+        single = [self.verifier.calculate_verdict(*args) for args in zip(claims, evidences, contexts)]
+        self.assertEqual(batch, single)
+        
+        # The grid lands on and either side of each threshold, with and without fact-checks
+        confidences = {(result['confidence'], bool(evidence['existing_factchecks']))
+                       for result, evidence in zip(single, evidences)}
+        for threshold, with_factchecks in ((0.3, False), (0.5, False), (0.6, True), (0.6, False),
+                                           (0.7, True), (0.7, False)):
+            for offset in (-0.01, 0.0, 0.01):
+                self.assertIn((round(threshold + offset, 2), with_factchecks), confidences)
+        
+        self.assertEqual(self.verifier.calculate_verdict_batch([], [], []), [])
+        with self.assertRaises(ValueError):
+            self.verifier.calculate_verdict_batch(claims[:2], evidences[:1], contexts[:2])
+    
+    def test_30c_combine_evidence_dedupes_urls(self):
+        """Test 30c: Evidence is merged with each URL counted once"""
+        first = {'url': 'https://www.reuters.com/article/claim', 'title': 'direct'}
+        evidence = {
+            'direct_evidence': [first],
+            'context': [
+                {'url': 'https://www.reuters.com/article/claim', 'title': 'context copy'},
+                {'url': 'https://WWW.Reuters.com/article/claim/', 'title': 'trailing slash'},
+                {'url': 'https://www.reuters.com/article/claim?utm_source=x', 'title': 'query'},
+                {'url': 'https://www.reuters.com/article/claim#section-2', 'title': 'fragment'},
+                {'url': 'https://apnews.com/article/claim', 'title': 'other page'}
+            ],
+            'existing_factchecks': [{'url': 'https://apnews.com/article/claim/', 'title': 'fact-check copy'}],
+            'key_fact_evidence': [
+                {'url': 'https://www.reuters.com/article/claim', 'title': 'key-fact copy'},
+                {'url': 'https://www.bbc.com/news/altitude', 'title': 'key fact'}
+            ]
+        }
+        combined = self.verifier._combine_evidence(evidence)
+        self.assertEqual([item['title'] for item in combined], ['direct', 'other page', 'key fact'])
+        self.assertIs(combined[0], first)
+    
+    def test_30d_combine_evidence_keeps_items_without_url(self):
+        """Test 30d: Evidence items without a URL are never merged"""
+        evidence = {
+            'direct_evidence': [{'title': 'no url'}, {'url': '', 'title': 'empty url'}],
+            'context': [{'title': 'no url'}],
+            'existing_factchecks': []
+        }
+        self.assertEqual(len(self.verifier._combine_evidence(evidence)), 3)
+        self.assertEqual(self.verifier._combine_evidence({}), [])
 
 
 class TestIntegration(unittest.TestCase):
     """Integration tests"""
     
+    @network_test
     def test_31_end_to_end_text_processing(self):
         """Test 31: End-to-end text processing pipeline"""
         try:
@@ -393,9 +1345,7 @@ class TestIntegration(unittest.TestCase):
             self.assertIn('main_claim', claims)
             
             # Verify (simplified)
-            evidence = {'direct_evidence': [], 'context': [], 'existing_factchecks': []}
-            context = {'missing_context': [], 'full_picture': '', 'timeline': []}
-            verdict = verifier.calculate_verdict(claims['main_claim'], evidence, context)
+            verdict = verifier.calculate_verdict(claims['main_claim'], EMPTY_EVIDENCE, EMPTY_CONTEXT)
             self.assertIn('verdict', verdict)
             
         except Exception as e:
@@ -407,45 +1357,147 @@ class TestIntegration(unittest.TestCase):
     
     def test_32_streamlit_app_imports(self):
         """Test 32: Streamlit app can be imported without errors"""
+        # Resolve next to this file so the test doesn't depend on the cwd
+        app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+        spec = importlib.util.spec_from_file_location("streamlit_app", app_path)
+        self.assertIsNotNone(spec)
+        
+        # Byte-compile rather than execute: running the module would start the
+        # Streamlit script; the cached .pyc also speeds up the app's next import
         try:
-            import sys
-            import os
-            # Temporarily add current directory to path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            if current_dir not in sys.path:
-                sys.path.insert(0, current_dir)
-            
-            # Try importing streamlit_app module
-            # We can't actually run it, but we can check if it imports cleanly
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("streamlit_app", "streamlit_app.py")
-            self.assertIsNotNone(spec)
-            
+            py_compile.compile(app_path, doraise=True)
+        except py_compile.PyCompileError as e:
+            self.fail(f"streamlit_app.py does not compile: {e.msg}")
+
+
+class TestVisionProbe(unittest.TestCase):
+    """Smoke test for the test_vision.py helpers against the installed dashscope SDK"""
+    
+    def test_33_setup_and_mocked_probe(self):
+        """Test 33: setup() wires the SDK to the shared session and probe() reads the reply"""
+        try:
+            import requests
+            import dashscope
+            import _vision_test_common as vision
         except ImportError as e:
-            if 'streamlit' in str(e):
-                self.skipTest("Streamlit not installed")
-            raise
+            self.skipTest(f"vision probe dependencies not installed: {e}")
+        
+        body = {
+            "request_id": "test",
+            "output": {"choices": [{
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "SUCCESS"}
+            }]},
+            "usage": {"input_tokens": 1, "output_tokens": 1}
+        }
+        
+        def send(adapter, request, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = json.dumps(body).encode("utf-8")
+            response.url = request.url
+            response.request = request
+            return response
+        
+        with mock.patch.dict(os.environ, {"DASHSCOPE_API_KEY": "sk-test"}), \
+             mock.patch.object(dashscope, "api_key", None), \
+             mock.patch.object(vision.HTTPAdapter, "send", autospec=True, side_effect=send) as sent, \
+             mock.patch.object(vision.PROBE_CACHE, "enabled", False):
+            vision.setup.cache_clear()
+            _, text_call, _ = vision.setup(verify=False)
+            result = vision.probe(
+                "text", text_call, model="qwen-plus",
+                messages=[{"role": "user", "content": "Respond with just the word 'SUCCESS'"}]
+            )
+            vision.setup.cache_clear()
+        
+        self.assertTrue(result.ok, result)
+        self.assertEqual(result.reply, "SUCCESS")
+        self.assertEqual(result.attempts, 1)
+        urls = [call.args[1].url for call in sent.call_args_list]
+        self.assertTrue(any("text-generation" in url for url in urls), urls)
+
+
+# Test classes in report order. They run one after another: several patch
+# module globals with mock.patch, which other classes would see if run alongside
+TEST_CASES = [
+    TestQwenClient, TestQwenClientOffline, TestResponseCache, TestInputProcessor,
+    TestQwenVisionClient, TestClaimExtractor, TestClaimExtractorOffline, TestSearchEngine,
+    TestSearchCache, TestContextAnalyzer, TestVerifier, TestIntegration, TestVisionProbe
+]
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    """TextTestResult that records each test's wall-clock duration"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.test_durations = []  # (test id, seconds)
+        self._start = None
+    
+    def startTest(self, test):
+        self._start = time.perf_counter()
+        super().startTest(test)
+    
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.test_durations.append((test.id(), time.perf_counter() - self._start))
+
+
+def _write_durations(durations):
+    """Append this run's per-test durations to the TEST_DURATIONS_CSV sidecar"""
+    path = os.getenv("TEST_DURATIONS_CSV", ".cache/test_durations.csv")
+    run_at = datetime.now().isoformat(timespec='seconds')
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        new_file = not os.path.exists(path)
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['run_at', 'test', 'seconds'])
+            writer.writerows((run_at, test_id, f"{seconds:.3f}") for test_id, seconds in durations)
+    except OSError as e:
+        print(f"Warning: could not write test durations: {e}")
 
 
 def run_tests_with_report():
     """Run all tests and generate detailed report"""
     
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestQwenClient))
-    suite.addTests(loader.loadTestsFromTestCase(TestInputProcessor))
-    suite.addTests(loader.loadTestsFromTestCase(TestClaimExtractor))
-    suite.addTests(loader.loadTestsFromTestCase(TestSearchEngine))
-    suite.addTests(loader.loadTestsFromTestCase(TestContextAnalyzer))
-    suite.addTests(loader.loadTestsFromTestCase(TestVerifier))
-    suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
-    
-    # Run tests with custom result
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    # Results stream to stdout as each test finishes; with the classes run
+    # one at a time on this thread, their output never interleaves
+    def run_test_case(test_case):
+        suite = unittest.TestLoader().loadTestsFromTestCase(test_case)
+        runner = unittest.TextTestRunner(stream=sys.stdout, verbosity=2, resultclass=TimedTextTestResult)
+        return runner.run(suite)
+    
+    # Dump every thread's stack periodically if a test hangs (e.g. on the network)
+    faulthandler.dump_traceback_later(int(os.getenv("TEST_HANG_TIMEOUT", 60)), repeat=True)
+    started = time.perf_counter()
+    
+    # Serially, in order (see TEST_CASES); run_tests_and_report.py runs the
+    # classes in separate processes where parallelism is wanted
+    try:
+        class_results = [run_test_case(test_case) for test_case in TEST_CASES]
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+    
+    elapsed = time.perf_counter() - started
+    
+    # Merge per-class results in order
+    result = unittest.TestResult()
+    durations = []
+    for class_result in class_results:
+        result.testsRun += class_result.testsRun
+        result.failures.extend(class_result.failures)
+        result.errors.extend(class_result.errors)
+        result.skipped.extend(class_result.skipped)
+        durations.extend(class_result.test_durations)
+    
+    _write_durations(durations)
+    print(f"\nWall time: {elapsed:.2f}s")
     
     return result
 
@@ -0,0 +1,216 @@
+"""
+Test Qwen Vision API access
+
+Probes the text model (qwen-plus) and the vision model (qwen-vl-plus)
+under one TLS mode, or all of them in a single interpreter:
+
+    python test_vision.py                         # default certificate verification
+    python test_vision.py --ssl-mode nossl        # SSL verification disabled
+    python test_vision.py --ssl-mode patched_ctx  # prebuilt unverified SSLContext
+    python test_vision.py --ssl-mode all          # all three, one import of dashscope
+    python test_vision.py --vision-only           # skip the text probe (or VISION_ONLY=1)
+
+Exits 1 if any probe failed.
+"""
+
+import argparse
+import os
+import ssl
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from _vision_test_common import (
+    BAR, PROBE_CACHE, ProbeResult, setup, probe, print_summary, buffered_output
+)
+
+# Build the TLS context once; every pooled connection reuses it instead of
+# creating (and loading a CA store into) a new one per connect.
+# Verification is disabled (only for testing!)
+# IMPORTANT: In production, fix your SSL certificates instead
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.check_hostname = False
+SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# TLS mode -> (verify setting for setup(), banner suffix). The setting is
+# applied once to that mode's shared session; nothing patches requests.Session
+# or http.client process-wide
+SSL_MODES = {
+    "default": (True, ""),
+    "nossl": (False, " (SSL verification disabled)"),
+    "patched_ctx": (SSL_CONTEXT, " (with SSL fix)"),
+}
+
+# Printed for each ProbeResult.error_kind
+DIAGNOSIS = {
+    "invalid": (
+        "  Your API key is INVALID or EXPIRED\n"
+        "  Solution: Check your Alibaba Cloud DashScope console"
+    ),
+    "notfound": (
+        "  Your API key does NOT have access to vision models!\n"
+        "  \n"
+        "  The 'qwen-vl-plus' model is not available with your key.\n"
+        "  \n"
+        "  Solutions:\n"
+        "    1. Enable vision models in Alibaba Cloud DashScope console\n"
+        "    2. Get a new API key with vision model access\n"
+        "    3. Use local OCR (Tesseract) instead:\n"
+        "       - Set use_vision_api=False when creating InputProcessor"
+    ),
+    "quota": (
+        "  QUOTA EXCEEDED or INSUFFICIENT CREDITS\n"
+        "  Solution: Add credits to your Alibaba Cloud account"
+    ),
+}
+
+# Probe requests, built once
+TEXT_MESSAGES = [{"role": "user", "content": "Respond with just the word 'SUCCESS'"}]
+VISION_MESSAGES = [{
+    "role": "user",
+    "content": [{"text": "Respond with just the words 'VISION API WORKS'"}]
+}]
+
+
+def run_mode(mode: str, executor: ThreadPoolExecutor, vision_only: bool = False) -> List[ProbeResult]:
+    """
+    Run the text and vision probes under one TLS mode and print the diagnosis
+
+    Args:
+        mode: Key of SSL_MODES
+        executor: Pool the two probes run on concurrently
+        vision_only: If True, skip the text probe
+
+    Returns:
+        [text result, vision result], or [vision result] if vision_only
+    """
+    verify, suffix = SSL_MODES[mode]
+
+    with buffered_output():
+        print("\n" + BAR)
+        print(f"QWEN VISION API TEST{suffix}")
+        print(BAR + "\n")
+
+        # Tests 1-2: Check API key and set up dashscope
+        print("Test 1-2: Checking API key and setting up dashscope...")
+        api_key, text_call, vision_call = setup(verify=verify)
+        print(f"API key found: {api_key[:15]}...{api_key[-4:]}")
+        print("dashscope configured\n")
+
+    # The text and vision probes are independent; start both so their round-trips overlap.
+    # Failures are recorded on each ProbeResult, so one failed probe never skips the other
+    if not vision_only:
+        text_future = executor.submit(
+            probe, f"{mode}: qwen-plus (text)",
+            text_call,
+            cache_tag=mode,
+            model="qwen-plus",
+            messages=TEXT_MESSAGES
+        )
+    vision_future = executor.submit(
+        probe, f"{mode}: qwen-vl-plus (vision)",
+        vision_call,
+        cache_tag=mode,
+        model="qwen-vl-plus",
+        messages=VISION_MESSAGES
+    )
+
+    if not vision_only:
+        # Test 3: Try text API first
+        with buffered_output():
+            print("Test 3: Testing Qwen text API (qwen-plus)...")
+            text = text_future.result()
+            if text.ok:
+                print("SUCCESS: Text API works!")
+                print(f"Response: {text.reply}\n")
+            elif text.status_code is None:
+                print(f"ERROR: {text.message}\n")
+            else:
+                print(f"FAILED:")
+                print(f"  Status: {text.status_code}")
+                print(f"  Code: {text.code}")
+                print(f"  Message: {text.message}\n")
+
+    # Test 4: Try vision API
+    with buffered_output():
+        print("Test 4: Testing Qwen Vision API (qwen-vl-plus)...")
+        vision = vision_future.result()
+        if vision.status_code is None:
+            print(f"EXCEPTION: {vision.message}")
+            print(f"\nThis usually means:")
+            print("  - Network connection issue")
+            print("  - SSL certificate issue (try --ssl-mode nossl)")
+            print("  - API endpoint unavailable")
+            print(BAR)
+        else:
+            print(f"Status code: {vision.status_code}")
+
+            if vision.ok:
+                print("SUCCESS: Vision API works!\n")
+                print(f"Response: {vision.reply}\n")
+                print(BAR)
+                print("RESULT: Your API key SUPPORTS vision models!")
+                print("        You can use qwen-vl-plus for image processing")
+                print(BAR)
+            else:
+                print(f"FAILED:")
+                print(f"  Code: {vision.code}")
+                print(f"  Message: {vision.message}")
+                print("\n" + BAR)
+                print("DIAGNOSIS:")
+
+                if vision.error_kind is None:
+                    print(f"  Unknown error: {vision.code} - {vision.message}")
+                else:
+                    print(DIAGNOSIS[vision.error_kind])
+
+                print(BAR)
+
+    return [vision] if vision_only else [text, vision]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the probes for the selected TLS mode(s) and print a summary
+
+    Returns:
+        Process exit code: 0 if every probe succeeded, else 1
+    """
+    parser = argparse.ArgumentParser(description="Check Qwen text and vision API access")
+    parser.add_argument(
+        "--ssl-mode",
+        choices=list(SSL_MODES) + ["all"],
+        default="default",
+        help="TLS verification strategy to probe with (default: default)"
+    )
+    parser.add_argument(
+        "--vision-only",
+        action="store_true",
+        default=os.getenv("VISION_ONLY", "0") == "1",
+        help="Only probe the vision model (also VISION_ONLY=1)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached probe results and call the API"
+    )
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        PROBE_CACHE.enabled = False
+
+    modes = list(SSL_MODES) if args.ssl_mode == "all" else [args.ssl_mode]
+
+    results = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for mode in modes:
+            results.extend(run_mode(mode, executor, vision_only=args.vision_only))
+
+    with buffered_output():
+        print("\n")
+        print_summary(results)
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())